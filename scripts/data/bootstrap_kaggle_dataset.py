@@ -4,6 +4,7 @@ import json
 import os
 import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
@@ -14,7 +15,7 @@ def parse_args() -> argparse.Namespace:
             "python3 scripts/data/bootstrap_kaggle_dataset.py "
             "[--source /path/to/kaggle/images/images] "
             "[--target ml/artifacts/datasets/kaggle-household-waste/images/images] "
-            "[--mode symlink|copy] [--force]"
+            "[--mode symlink|copy] [--force] [--serial-copy]"
         ),
     )
     parser.add_argument("--source", default=os.environ.get("KAGGLE_WASTE_DIR", ""), help="Source Kaggle images root.")
@@ -25,6 +26,11 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--mode", choices=("symlink", "copy"), default="symlink", help="Bootstrap mode.")
     parser.add_argument("--force", action="store_true", help="Replace existing target if present.")
+    parser.add_argument(
+        "--serial-copy",
+        action="store_true",
+        help="Copy with a single shutil.copytree walk instead of per-class-folder threads.",
+    )
     return parser.parse_args()
 
 
@@ -54,9 +60,9 @@ def validate_source(source_path: Path) -> None:
         raise SystemExit(f"Kaggle source appears empty or unexpected (no class subfolders): {source_path}")
 
 
-def is_path_inside_repo(repo_root: Path, target_path: Path) -> bool:
+def is_path_inside_repo(repo_root_resolved: Path, target_path: Path) -> bool:
     try:
-        target_path.resolve().relative_to(repo_root.resolve())
+        target_path.resolve().relative_to(repo_root_resolved)
         return True
     except ValueError:
         return False
@@ -76,9 +82,32 @@ def ensure_clean_target(target_path: Path, force: bool) -> None:
     shutil.rmtree(target_path, ignore_errors=True)
 
 
-def copy_recursive(source_path: Path, target_path: Path) -> None:
+def copy_recursive(source_path: Path, target_path: Path, serial: bool = False) -> None:
     target_path.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copytree(source_path, target_path, dirs_exist_ok=True)
+    if serial:
+        shutil.copytree(source_path, target_path, dirs_exist_ok=True)
+        return
+
+    # Class folders are independent, so copy them concurrently; there are only a
+    # handful of top-level files, if any.
+    target_path.mkdir(exist_ok=True)
+    with os.scandir(source_path) as entries:
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir():
+                subdirs.append(entry)
+            else:
+                shutil.copy2(entry.path, target_path / entry.name)
+
+    workers = min(16, (os.cpu_count() or 1) * 2)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(
+            executor.map(
+                lambda entry: shutil.copytree(entry.path, target_path / entry.name, dirs_exist_ok=True),
+                subdirs,
+            )
+        )
+    shutil.copystat(source_path, target_path)
 
 
 def link_dataset(source_path: Path, target_path: Path) -> None:
@@ -100,7 +129,7 @@ def main() -> None:
     if source_path is None:
         raise SystemExit("Kaggle source directory not found. Pass --source or set KAGGLE_WASTE_DIR.")
 
-    target_path = Path(args.target).expanduser().resolve()
+    target_path = Path(os.path.abspath(Path(args.target).expanduser()))
 
     validate_source(source_path)
 
@@ -110,13 +139,13 @@ def main() -> None:
     ensure_clean_target(target_path, args.force)
 
     if args.mode == "copy":
-        copy_recursive(source_path, target_path)
+        copy_recursive(source_path, target_path, args.serial_copy)
     else:
         try:
             link_dataset(source_path, target_path)
         except OSError:
             # Symlink permissions can fail on some systems; fallback to copy.
-            copy_recursive(source_path, target_path)
+            copy_recursive(source_path, target_path, args.serial_copy)
             args.mode = "copy"
 
     print("Kaggle dataset bootstrap complete")
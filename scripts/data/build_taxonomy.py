@@ -1,10 +1,21 @@
 #!/usr/bin/env python3
 import argparse
 import json
-import re
+import os
+import sys
 from datetime import datetime, timezone
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+# Maps every byte outside [a-z0-9] to a space so one bytes.split() yields the alnum runs.
+ALNUM_SEPARATOR_TABLE = bytes(c if c in b"0123456789abcdefghijklmnopqrstuvwxyz" else 0x20 for c in range(256))
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -27,36 +38,41 @@ def rel_or_abs(path: Path, cwd: Path) -> str:
         return str(path)
 
 
+def write_json(file_path: Path, payload) -> None:
+    if orjson is not None:
+        file_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
+    with file_path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+        handle.write("\n")
+
+
 def find_default_pack_path() -> Path | None:
     packs_dir = (Path("assets") / "packs").resolve()
     if not packs_dir.exists() or not packs_dir.is_dir():
         return None
-    entries = sorted([entry for entry in packs_dir.iterdir() if entry.name.endswith(".pack.json")])
-    return entries[0] if entries else None
+    with os.scandir(packs_dir) as entries:
+        first = min((entry.name for entry in entries if entry.name.endswith(".pack.json")), default=None)
+    return packs_dir / first if first else None
+
 
+def alnum_runs(value: str) -> list[bytes]:
+    # Lowercase before encoding: a few non-ASCII letters lowercase to ASCII (e.g. the Kelvin sign).
+    return str(value or "").lower().encode("ascii", "replace").translate(ALNUM_SEPARATOR_TABLE).split()
 
+
+@lru_cache(maxsize=8192)
 def normalize_alias(value: str) -> str:
-    text = re.sub(r"[^a-z0-9]+", " ", str(value or "").lower())
-    return re.sub(r"\s+", " ", text).strip()
+    return b" ".join(alnum_runs(value)).decode("ascii")
 
 
+@lru_cache(maxsize=8192)
 def to_slug(value: str) -> str:
-    text = re.sub(r"[^a-z0-9]+", "-", str(value or "").lower())
-    text = re.sub(r"^-+|-+$", "", text)
-    return text[:80]
+    return b"-".join(alnum_runs(value)).decode("ascii")[:80]
 
 
 def unique(values: list[str]) -> list[str]:
-    seen = set()
-    out = []
-    for value in values:
-        if not value:
-            continue
-        if value in seen:
-            continue
-        seen.add(value)
-        out.append(value)
-    return out
+    return list(dict.fromkeys(value for value in values if value))
 
 
 def get_primary_outcome(option_cards: list[dict]) -> str | None:
@@ -75,57 +91,61 @@ def get_primary_outcome(option_cards: list[dict]) -> str | None:
 
 
 def get_item_record(item: dict) -> dict:
-    item_id = str(item.get("id") or "").strip()
-    name = str(item.get("name") or "").strip()
-    keywords = [str(k or "").strip() for k in (item.get("keywords") if isinstance(item.get("keywords"), list) else [])]
-    keywords = [k for k in keywords if k]
+    # Interned so repeated keywords/outcomes across items share one string object.
+    intern = sys.intern
+    get = item.get
+    item_id = intern(str(get("id") or "").strip())
+    name = intern(str(get("name") or "").strip())
+    raw_keywords = get("keywords")
+    keywords = (
+        [keyword for keyword in (intern(str(k or "").strip()) for k in raw_keywords) if keyword]
+        if isinstance(raw_keywords, list)
+        else []
+    )
     aliases = unique([name, *keywords])
 
-    option_cards = item.get("option_cards") if isinstance(item.get("option_cards"), list) else []
-    outcomes = unique([str(card.get("kind") or "").strip() for card in option_cards if isinstance(card, dict)])
-    outcomes = [outcome for outcome in outcomes if outcome]
+    raw_cards = get("option_cards")
+    option_cards = raw_cards if isinstance(raw_cards, list) else []
+    cards = [card for card in option_cards if isinstance(card, dict)]
+    outcomes = unique([intern(str(card.get("kind") or "").strip()) for card in cards])
     primary_outcome = get_primary_outcome(option_cards)
+    card_ids = (str(card.get("id") or "").strip() for card in cards)
 
     return {
         "item_id": item_id,
         "canonical_label": name,
         "class_id": to_slug(name or item_id),
         "aliases": aliases,
-        "normalized_aliases": unique([normalize_alias(alias) for alias in aliases]),
+        "normalized_aliases": unique([intern(normalize_alias(alias)) for alias in aliases]),
         "outcomes": outcomes,
         "primary_outcome": primary_outcome,
-        "option_card_ids": [
-            str(card.get("id") or "").strip()
-            for card in option_cards
-            if isinstance(card, dict) and str(card.get("id") or "").strip()
-        ],
+        "option_card_ids": [card_id for card_id in card_ids if card_id],
     }
 
 
-def create_alias_index(item_records: list[dict]) -> dict[str, list[str]]:
-    alias_map: dict[str, set[str]] = {}
-    for record in item_records:
-        item_id = str(record.get("item_id") or "").strip()
-        for alias in (record.get("normalized_aliases") if isinstance(record.get("normalized_aliases"), list) else []):
-            alias = str(alias or "").strip()
-            if not alias:
-                continue
-            alias_map.setdefault(alias, set()).add(item_id)
-
-    out: dict[str, list[str]] = {}
-    for alias in sorted(alias_map.keys()):
-        out[alias] = sorted(alias_map[alias])
-    return out
-
-
-def create_outcome_counts(item_records: list[dict]) -> dict[str, int]:
-    counts: dict[str, int] = {}
-    for record in item_records:
-        for kind in (record.get("outcomes") if isinstance(record.get("outcomes"), list) else []):
-            text = str(kind or "").strip()
-            if not text:
-                continue
-            counts[text] = counts.get(text, 0) + 1
+def add_to_alias_index(alias_map: dict[str, list[str]], record: dict) -> None:
+    # Most aliases belong to a single item, so keep plain lists rather than a set per alias.
+    item_id = record["item_id"]
+    for alias in record["normalized_aliases"]:
+        if not alias:
+            continue
+        existing = alias_map.get(alias)
+        if existing is None:
+            alias_map[alias] = [item_id]
+        elif item_id not in existing:
+            existing.append(item_id)
+
+
+def add_outcome_counts(counts: dict[str, int], record: dict) -> None:
+    for kind in record["outcomes"]:
+        counts[kind] = counts.get(kind, 0) + 1
+
+
+def sort_alias_index(alias_map: dict[str, list[str]]) -> dict[str, list[str]]:
+    return {alias: sorted(item_ids) if len(item_ids) > 1 else item_ids for alias, item_ids in sorted(alias_map.items())}
+
+
+def sort_outcome_counts(counts: dict[str, int]) -> dict[str, int]:
     return {key: counts[key] for key in sorted(counts.keys())}
 
 
@@ -143,9 +163,25 @@ def main() -> None:
     items = pack.get("items") if isinstance(pack, dict) else []
     items = items if isinstance(items, list) else []
 
-    item_records = [get_item_record(item) for item in items if isinstance(item, dict)]
-    item_records = [record for record in item_records if record["item_id"] and record["canonical_label"]]
-    item_records.sort(key=lambda record: str(record.get("canonical_label") or ""))
+    # Summary totals, outcome counts and the alias index are all order-independent,
+    # so accumulate them while the records are built instead of re-walking the list.
+    item_records = []
+    alias_map: dict[str, list[str]] = {}
+    outcome_counts: dict[str, int] = {}
+    alias_count = 0
+    normalized_alias_count = 0
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        record = get_item_record(item)
+        if not record["item_id"] or not record["canonical_label"]:
+            continue
+        item_records.append(record)
+        alias_count += len(record["aliases"])
+        normalized_alias_count += len(record["normalized_aliases"])
+        add_to_alias_index(alias_map, record)
+        add_outcome_counts(outcome_counts, record)
+    item_records.sort(key=itemgetter("canonical_label"))
 
     taxonomy = {
         "taxonomy_id": "municipal-taxonomy-v1",
@@ -159,16 +195,16 @@ def main() -> None:
         },
         "summary": {
             "item_count": len(item_records),
-            "alias_count": sum(len(record.get("aliases") or []) for record in item_records),
-            "normalized_alias_count": sum(len(record.get("normalized_aliases") or []) for record in item_records),
-            "outcome_counts": create_outcome_counts(item_records),
+            "alias_count": alias_count,
+            "normalized_alias_count": normalized_alias_count,
+            "outcome_counts": sort_outcome_counts(outcome_counts),
         },
         "vision_classes": item_records,
-        "alias_index": create_alias_index(item_records),
+        "alias_index": sort_alias_index(alias_map),
     }
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(taxonomy, indent=2) + "\n", encoding="utf-8")
+    write_json(out_path, taxonomy)
 
     print(f"Generated taxonomy for {len(item_records)} items.")
     print(f"- {rel_or_abs(out_path, cwd)}")
@@ -2,6 +2,7 @@
 import argparse
 import csv
 import json
+from collections import defaultdict
 from pathlib import Path
 
 
@@ -41,34 +42,35 @@ def rel_or_abs(path: Path, cwd: Path) -> str:
 
 
 def read_rows(path: Path) -> list[dict]:
-    lines = path.read_text(encoding="utf-8").splitlines()
-    lines = [line for line in lines if line.strip()]
-    if len(lines) <= 1:
-        return []
-
     rows = []
-    for line in lines[1:]:
-        cols = next(csv.reader([line]))
-        rows.append(
-            {
-                "name": str(cols[0] if len(cols) > 0 else "").strip(),
-                "url": str(cols[1] if len(cols) > 1 else "").strip(),
-                "item_id": str(cols[2] if len(cols) > 2 else "").strip(),
-                "canonical_label": str(cols[3] if len(cols) > 3 else "").strip(),
-                "source": str(cols[4] if len(cols) > 4 else "").strip(),
-                "notes": str(cols[5] if len(cols) > 5 else "").strip(),
-            }
-        )
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        reader = csv.reader(handle)
+        has_header = False
+        for cols in reader:
+            if not cols or (len(cols) == 1 and not cols[0].strip()):
+                continue
+            if not has_header:
+                has_header = True
+                continue
+            rows.append(
+                {
+                    "name": str(cols[0] if len(cols) > 0 else "").strip(),
+                    "url": str(cols[1] if len(cols) > 1 else "").strip(),
+                    "item_id": str(cols[2] if len(cols) > 2 else "").strip(),
+                    "canonical_label": str(cols[3] if len(cols) > 3 else "").strip(),
+                    "source": str(cols[4] if len(cols) > 4 else "").strip(),
+                    "notes": str(cols[5] if len(cols) > 5 else "").strip(),
+                }
+            )
     return rows
 
 
 def write_rows(path: Path, rows: list[dict]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=HEADER)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow({column: row.get(column, "") for column in HEADER})
+        writer = csv.writer(handle)
+        writer.writerow(HEADER)
+        writer.writerows([row.get(column, "") for column in HEADER] for row in rows)
 
 
 def append_note(notes: str, marker: str) -> str:
@@ -96,12 +98,11 @@ def main() -> None:
 
     rows = read_rows(input_path)
 
-    by_url: dict[str, list[tuple[dict, int]]] = {}
-    for index, row in enumerate(rows):
-        url = str(row.get("url") or "").strip()
-        if not url:
-            continue
-        by_url.setdefault(url, []).append((row, index))
+    by_url: defaultdict[str, list[dict]] = defaultdict(list)
+    for row in rows:
+        url = row["url"]
+        if url:
+            by_url[url].append(row)
 
     changed = 0
     groups = 0
@@ -109,14 +110,12 @@ def main() -> None:
         if len(entries) < 2:
             continue
         groups += 1
-        keep_pos = 0 if keep_first else len(entries) - 1
-        for pos, (row, _) in enumerate(entries):
-            if pos == keep_pos:
-                continue
-            if not row.get("url"):
+        keep = entries[0] if keep_first else entries[-1]
+        for row in entries:
+            if row is keep:
                 continue
             row["url"] = ""
-            row["notes"] = append_note(row.get("notes", ""), "Needs unique URL (csv dedupe).")
+            row["notes"] = append_note(row["notes"], "Needs unique URL (csv dedupe).")
             changed += 1
 
     if not args.dry_run:
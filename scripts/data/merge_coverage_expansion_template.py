@@ -2,6 +2,8 @@
 import argparse
 import csv
 import json
+from collections.abc import Iterator
+from itertools import chain
 from pathlib import Path
 
 
@@ -44,68 +46,71 @@ def rel_or_abs(path: Path, cwd: Path) -> str:
         return str(path)
 
 
+def iter_nonblank_rows(file_path: Path) -> Iterator[list[str]]:
+    with file_path.open("r", encoding="utf-8", newline="") as handle:
+        for cols in csv.reader(handle):
+            if cols and (len(cols) > 1 or cols[0].strip()):
+                yield cols
+
+
+def labeled_row(cols: list[str]) -> dict:
+    return {
+        "name": str(cols[0] if len(cols) > 0 else "").strip(),
+        "url": str(cols[1] if len(cols) > 1 else "").strip(),
+        "item_id": str(cols[2] if len(cols) > 2 else "").strip(),
+        "canonical_label": str(cols[3] if len(cols) > 3 else "").strip(),
+        "source": str(cols[4] if len(cols) > 4 else "").strip(),
+        "notes": str(cols[5] if len(cols) > 5 else "").strip(),
+    }
+
+
+def template_row(cols: list[str]) -> dict:
+    return {
+        "name": str(cols[0] if len(cols) > 0 else "").strip(),
+        "url": str(cols[1] if len(cols) > 1 else "").strip(),
+        "item_id": str(cols[2] if len(cols) > 2 else "").strip(),
+        "canonical_label": str(cols[3] if len(cols) > 3 else "").strip(),
+        "current_ready_count": str(cols[4] if len(cols) > 4 else "").strip(),
+        "target_ready_count": str(cols[5] if len(cols) > 5 else "").strip(),
+        "needed_for_target": str(cols[6] if len(cols) > 6 else "").strip(),
+        "notes": str(cols[7] if len(cols) > 7 else "").strip(),
+    }
+
+
 def read_csv_rows(file_path: Path) -> list[dict]:
     if not file_path.exists():
         return []
-    lines = file_path.read_text(encoding="utf-8").splitlines()
-    lines = [line for line in lines if line.strip()]
-    if not lines:
+    lines = iter_nonblank_rows(file_path)
+    first = next(lines, None)
+    if first is None:
         return []
 
-    has_header = "name" in lines[0].lower() and "," in lines[0].lower()
-    start = 1 if has_header else 0
-    rows = []
-    for line in lines[start:]:
-        cols = next(csv.reader([line]))
-        rows.append(
-            {
-                "name": str(cols[0] if len(cols) > 0 else "").strip(),
-                "url": str(cols[1] if len(cols) > 1 else "").strip(),
-                "item_id": str(cols[2] if len(cols) > 2 else "").strip(),
-                "canonical_label": str(cols[3] if len(cols) > 3 else "").strip(),
-                "source": str(cols[4] if len(cols) > 4 else "").strip(),
-                "notes": str(cols[5] if len(cols) > 5 else "").strip(),
-            }
-        )
+    has_header = len(first) > 1 and any("name" in cell.lower() for cell in first)
+    rows = [] if has_header else [labeled_row(first)]
+    rows.extend(labeled_row(cols) for cols in lines)
     return rows
 
 
 def read_template_rows(file_path: Path) -> list[dict]:
     if not file_path.exists():
         return []
-    lines = file_path.read_text(encoding="utf-8").splitlines()
-    lines = [line for line in lines if line.strip()]
-    if not lines:
+    lines = iter_nonblank_rows(file_path)
+    first = next(lines, None)
+    if first is None:
         return []
 
-    has_header = "name" in lines[0].lower() and "canonical_label" in lines[0].lower()
-    start = 1 if has_header else 0
-
-    rows = []
-    for line in lines[start:]:
-        cols = next(csv.reader([line]))
-        row = {
-            "name": str(cols[0] if len(cols) > 0 else "").strip(),
-            "url": str(cols[1] if len(cols) > 1 else "").strip(),
-            "item_id": str(cols[2] if len(cols) > 2 else "").strip(),
-            "canonical_label": str(cols[3] if len(cols) > 3 else "").strip(),
-            "current_ready_count": str(cols[4] if len(cols) > 4 else "").strip(),
-            "target_ready_count": str(cols[5] if len(cols) > 5 else "").strip(),
-            "needed_for_target": str(cols[6] if len(cols) > 6 else "").strip(),
-            "notes": str(cols[7] if len(cols) > 7 else "").strip(),
-        }
-        if row["name"]:
-            rows.append(row)
-    return rows
+    first_cells = [cell.lower() for cell in first]
+    has_header = any("name" in cell for cell in first_cells) and any("canonical_label" in cell for cell in first_cells)
+    candidates = lines if has_header else chain([first], lines)
+    return [row for row in map(template_row, candidates) if row["name"]]
 
 
 def write_rows(file_path: Path, rows: list[dict]) -> None:
     file_path.parent.mkdir(parents=True, exist_ok=True)
     with file_path.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=HEADER)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow({column: row.get(column, "") for column in HEADER})
+        writer = csv.writer(handle)
+        writer.writerow(HEADER)
+        writer.writerows([row.get(column, "") for column in HEADER] for row in rows)
 
 
 def merge_notes(existing: str, addition: str) -> str:
@@ -136,22 +141,27 @@ def main() -> None:
     input_rows = read_csv_rows(input_path)
     template_rows = read_template_rows(template_path)
 
-    by_name = {row["name"]: row for row in input_rows if row.get("name")}
+    by_name = {row["name"]: row for row in input_rows if row["name"]}
 
     added = 0
     enriched = 0
     unchanged = 0
 
+    # Input and template rows are all shaped by labeled_row/template_row, so index
+    # them directly instead of going through .get() defaults.
     for row in template_rows:
-        existing = by_name.get(row["name"])
+        name = row["name"]
+        item_id = row["item_id"]
+        canonical_label = row["canonical_label"]
+        existing = by_name.get(name)
         template_note = f"coverage-expansion target={row['target_ready_count']} needed={row['needed_for_target']}"
 
         if not existing:
-            by_name[row["name"]] = {
-                "name": row["name"],
-                "url": row["url"] or "",
-                "item_id": row["item_id"] or "",
-                "canonical_label": row["canonical_label"] or "",
+            by_name[name] = {
+                "name": name,
+                "url": row["url"],
+                "item_id": item_id,
+                "canonical_label": canonical_label,
                 "source": "coverage_expansion_queue",
                 "notes": merge_notes(row["notes"], template_note),
             }
@@ -159,18 +169,19 @@ def main() -> None:
             continue
 
         changed = False
-        if not existing.get("item_id") and row.get("item_id"):
-            existing["item_id"] = row["item_id"]
+        if not existing["item_id"] and item_id:
+            existing["item_id"] = item_id
             changed = True
-        if not existing.get("canonical_label") and row.get("canonical_label"):
-            existing["canonical_label"] = row["canonical_label"]
+        if not existing["canonical_label"] and canonical_label:
+            existing["canonical_label"] = canonical_label
             changed = True
-        if not existing.get("source"):
+        if not existing["source"]:
             existing["source"] = "coverage_expansion_queue"
             changed = True
 
-        merged_notes = merge_notes(existing.get("notes", ""), template_note)
-        if merged_notes != existing.get("notes", ""):
+        existing_notes = existing["notes"]
+        merged_notes = merge_notes(existing_notes, template_note)
+        if merged_notes != existing_notes:
             existing["notes"] = merged_notes
             changed = True
 
@@ -179,7 +190,7 @@ def main() -> None:
         else:
             unchanged += 1
 
-    merged_rows = sorted(by_name.values(), key=lambda row: str(row.get("name") or ""))
+    merged_rows = [by_name[name] for name in sorted(by_name)]
 
     if not args.dry_run:
         write_rows(out_path, merged_rows)
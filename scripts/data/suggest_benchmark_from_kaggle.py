@@ -5,10 +5,12 @@ import json
 import os
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
 HEADER = ["name", "url", "item_id", "canonical_label", "source", "notes"]
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".webp")
 
 
 def parse_args() -> argparse.Namespace:
@@ -40,6 +42,18 @@ def parse_args() -> argparse.Namespace:
         help="Output CSV path for generated suggestions.",
     )
     parser.add_argument("--merge-into", default=None, help="Optional benchmark CSV to merge suggestions into.")
+    parser.add_argument(
+        "--copy-workers",
+        type=int,
+        default=(os.cpu_count() or 4) * 2,
+        help="Concurrent image copies into the cache.",
+    )
+    parser.add_argument(
+        "--copy-mode",
+        choices=("hardlink", "copy"),
+        default="hardlink",
+        help="How to place Kaggle images in the cache (hardlink falls back to copy across devices).",
+    )
     return parser.parse_args()
 
 
@@ -63,10 +77,12 @@ def load_json(path: Path):
 
 
 def rel_or_abs(path: Path, cwd: Path) -> str:
+    # cwd is resolved once in main; paths built from resolved directories skip another resolve().
+    path = path if path.is_absolute() else path.resolve()
     try:
-        return str(path.resolve().relative_to(cwd.resolve())).replace(os.sep, "/")
+        return str(path.relative_to(cwd)).replace(os.sep, "/")
     except ValueError:
-        return str(path.resolve())
+        return str(path)
 
 
 def as_list(value) -> list:
@@ -84,24 +100,34 @@ def label_for_entry(entry: dict) -> str:
 
 
 def list_images(folder_path: Path) -> list[Path]:
-    if not folder_path.exists():
+    if not folder_path.is_dir():
         return []
+    # DirEntry caches the type from the directory read, so no per-file stat is needed.
+    # Like rglob, symlinked files are kept but symlinked directories are not descended.
     out = []
-    for path in folder_path.rglob("*"):
-        if path.is_file() and re.search(r"\.(jpg|jpeg|png|webp)$", path.name, flags=re.IGNORECASE):
-            out.append(path)
-    out.sort(key=lambda item: str(item).lower())
-    return out
+    pending = [str(folder_path)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file() and entry.name.lower().endswith(IMAGE_EXTS):
+                        out.append(entry.path)
+        except PermissionError:
+            continue
+    out.sort(key=str.lower)
+    return [Path(path) for path in out]
 
 
-def build_image_pool(kaggle_dir: Path) -> dict[str, list[Path]]:
-    pool = {}
-    if not kaggle_dir.exists():
-        return pool
-    for folder in sorted(kaggle_dir.iterdir(), key=lambda item: item.name.lower()):
-        if folder.is_dir():
-            pool[folder.name] = list_images(folder)
-    return pool
+def list_folders(kaggle_dir: Path, folders: list[str]) -> dict[str, dict]:
+    # Each folder is an independent directory walk, so the listings overlap on a thread pool.
+    if not folders:
+        return {}
+    workers = min(16, (os.cpu_count() or 1) * 2, len(folders))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        listings = executor.map(list_images, [kaggle_dir / folder for folder in folders])
+        return {folder: {"images": images, "cursor": 0} for folder, images in zip(folders, listings)}
 
 
 def get_mapping() -> dict[str, list[str]]:
@@ -139,30 +165,49 @@ def extension_from_path(file_path: Path) -> str:
     return ext if ext else ".jpg"
 
 
-def pick_next_image(folders: list[str], pool: dict[str, list[Path]], used: set[str]):
+def pick_next_image(folders: list[str], pool: dict[str, dict]):
+    # Images are handed out in listing order, so a per-folder cursor stands in for a used-path set.
+    fallback = None
     for folder in folders:
-        images = pool.get(folder, [])
-        for candidate in images:
-            key = str(candidate)
-            if key not in used:
-                used.add(key)
-                return {"image_path": candidate, "folder": folder}
-
-    for folder in folders:
-        images = pool.get(folder, [])
-        if images:
-            return {"image_path": images[0], "folder": folder}
-
-    return None
+        state = pool[folder]
+        images = state["images"]
+        cursor = state["cursor"]
+        if cursor < len(images):
+            state["cursor"] = cursor + 1
+            return {"image_path": images[cursor], "folder": folder}
+        if fallback is None and images:
+            fallback = {"image_path": images[0], "folder": folder}
+
+    return fallback
+
+
+def copy_local(image_path: Path, out_file: Path, mode: str = "hardlink") -> None:
+    if mode == "hardlink":
+        try:
+            os.link(image_path, out_file)
+            return
+        except OSError:
+            # Cross-device or unsupported filesystem; fall back to a byte copy.
+            pass
+    shutil.copyfile(image_path, out_file)
+
+
+def copy_all_to_cache(jobs: dict[Path, Path], workers: int, mode: str = "hardlink") -> None:
+    # shutil.copyfile already uses sendfile on Linux; the pool overlaps the copies.
+    if not jobs:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [executor.submit(copy_local, image_path, out_file, mode) for out_file, image_path in jobs.items()]
+        for future in futures:
+            future.result()
 
 
 def write_rows(path: Path, rows: list[dict]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=HEADER)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow({column: row.get(column, "") for column in HEADER})
+        writer = csv.writer(handle)
+        writer.writerow(HEADER)
+        writer.writerows([row.get(column, "") for column in HEADER] for row in rows)
 
 
 def read_rows(path: Path) -> list[dict]:
@@ -186,12 +231,12 @@ def merge_rows(existing_rows: list[dict], new_rows: list[dict]) -> list[dict]:
         name = str(row.get("name") or "").strip()
         if name:
             by_name[name] = row
-    return [by_name[key] for key in sorted(by_name.keys(), key=lambda value: value.lower())]
+    return [by_name[key] for key in sorted(by_name, key=str.lower)]
 
 
 def main() -> None:
     args = parse_args()
-    cwd = Path.cwd()
+    cwd = Path.cwd().resolve()
 
     manifest_path = Path(args.manifest).resolve()
     kaggle_dir = resolve_kaggle_dir(args.kaggle_dir)
@@ -206,37 +251,37 @@ def main() -> None:
     manifest = load_json(manifest_path)
     images = as_list(manifest.get("images") if isinstance(manifest, dict) else [])
     mapping = get_mapping()
-    pool = build_image_pool(kaggle_dir)
-    used_paths: set[str] = set()
     rows: list[dict] = []
+    copy_jobs: dict[Path, Path] = {}
 
     cache_dir.mkdir(parents=True, exist_ok=True)
 
-    for entry in images:
-        if not isinstance(entry, dict):
-            continue
-        status = str(entry.get("status") or "").lower()
-        if status != "todo":
-            continue
+    todo_entries = [
+        entry for entry in images if isinstance(entry, dict) and str(entry.get("status") or "").lower() == "todo"
+    ]
+    # Only folders mapped from todo labels are listed.
+    needed_folders = dict.fromkeys(folder for entry in todo_entries for folder in mapping.get(label_for_entry(entry)) or [])
+    pool = list_folders(kaggle_dir, list(needed_folders))
 
+    for entry in todo_entries:
         label = label_for_entry(entry)
         folders = mapping.get(label)
         if not folders:
             continue
 
-        picked = pick_next_image(folders, pool, used_paths)
+        picked = pick_next_image(folders, pool)
         if not picked:
             continue
 
-        image_path = Path(picked["image_path"])
-        ext = extension_from_path(image_path)
-        out_file = cache_dir / f"{sanitize_name(str(entry.get('name') or 'sample')) or 'sample'}{ext}"
-        if not out_file.exists():
-            shutil.copyfile(image_path, out_file)
+        image_path = picked["image_path"]
+        name = entry.get("name")
+        out_file = cache_dir / f"{sanitize_name(str(name or 'sample')) or 'sample'}{extension_from_path(image_path)}"
+        if out_file not in copy_jobs and not out_file.exists():
+            copy_jobs[out_file] = image_path
 
         rows.append(
             {
-                "name": str(entry.get("name") or "").strip(),
+                "name": str(name or "").strip(),
                 "url": rel_or_abs(out_file, cwd),
                 "item_id": str(entry.get("item_id") or "").strip(),
                 "canonical_label": label,
@@ -245,6 +290,7 @@ def main() -> None:
             }
         )
 
+    copy_all_to_cache(copy_jobs, args.copy_workers, args.copy_mode)
     write_rows(out_path, rows)
 
     merged_count = None
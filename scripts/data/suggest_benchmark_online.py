@@ -1,19 +1,51 @@
 #!/usr/bin/env python3
 import argparse
 import csv
+import gzip
+import http.client
 import json
+import os
 import re
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 from pathlib import Path
 
-
-HEADER = ["name", "url", "item_id", "canonical_label", "source", "notes"]
+try:
+    import orjson
+except Exception:
+    orjson = None
 
 
-def parse_args() -> argparse.Namespace:
+HEADER = ["name", "url", "item_id", "canonical_label", "source", "notes"]
+COMMONS_HOST = "commons.wikimedia.org"
+COMMONS_REQUEST_HEADERS = {
+    "User-Agent": "repath-mobile-benchmark-bot/1.0 (local dev)",
+    "Accept-Encoding": "gzip",
+    "Connection": "keep-alive",
+}
+SEARCH_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+LABEL_PUNCT_RE = re.compile(r"[(),&]")
+OTHER_THAN_RE = re.compile(r"\bother than\b", re.IGNORECASE)
+MEAL_KIT_RE = re.compile(r"\bmeal kit\b", re.IGNORECASE)
+SINGLE_USE_RE = re.compile(r"\bsingle-use\b", re.IGNORECASE)
+WHITESPACE_RE = re.compile(r"\s+")
+ID_SEPARATOR_RE = re.compile(r"[-_]+")
+DEPTH_RE = re.compile(r"\bdepth\b", re.IGNORECASE)
+SLASH_RE = re.compile(r"/+")
+LABEL_SPLIT_RE = re.compile(r"/|\bor\b", re.IGNORECASE)
+PLASTIC_ELECTION_SIGN_RE = re.compile(r"\bplastic film election sign\b", re.IGNORECASE)
+PAPERBOARD_ELECTION_SIGN_RE = re.compile(r"\bpaperboard election sign\b", re.IGNORECASE)
+BAGS_RE = re.compile(r"\bbags\b", re.IGNORECASE)
+CONTAINERS_RE = re.compile(r"\bcontainers\b", re.IGNORECASE)
+# Maps every byte outside [a-z0-9] to a space so one bytes.split() yields the alnum runs.
+ALNUM_SEPARATOR_TABLE = bytes(c if c in b"0123456789abcdefghijklmnopqrstuvwxyz" else 0x20 for c in range(256))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Suggest benchmark URLs from Wikimedia Commons for unresolved labeled rows.",
         usage=(
@@ -22,7 +54,8 @@ def parse_args() -> argparse.Namespace:
             "[--out test/benchmarks/benchmark-labeled.online.csv] "
             "[--merge-into test/benchmarks/benchmark-labeled.csv] "
             "[--limit 30] [--offset 0] [--timeout-ms 15000] [--max-retries 3] "
-            "[--include-previous-failures]"
+            "[--include-previous-failures] [--workers 4] "
+            "[--search-cache test/benchmarks/.commons_search_cache.json] [--no-search-cache]"
         ),
     )
     parser.add_argument("--input", default=str(Path("test") / "benchmarks" / "benchmark-labeled.csv"))
@@ -33,20 +66,30 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--timeout-ms", type=int, default=15000)
     parser.add_argument("--max-retries", type=int, default=3)
     parser.add_argument("--include-previous-failures", action="store_true")
-    args = parser.parse_args()
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent Commons searches.")
+    parser.add_argument(
+        "--search-cache",
+        default=str(Path("test") / "benchmarks" / ".commons_search_cache.json"),
+        help="Commons search results reused across runs for 30 days.",
+    )
+    parser.add_argument("--no-search-cache", action="store_true", help="Query Commons for every search.")
+    args = parser.parse_args(argv)
 
     args.limit = args.limit if args.limit and args.limit > 0 else 30
     args.offset = args.offset if args.offset and args.offset >= 0 else 0
     args.timeout_ms = args.timeout_ms if args.timeout_ms and args.timeout_ms >= 1000 else 15000
     args.max_retries = args.max_retries if args.max_retries and args.max_retries >= 1 else 3
+    args.workers = args.workers if args.workers and args.workers >= 1 else 4
     return args
 
 
 def rel_or_abs(path: Path, cwd: Path) -> str:
+    # cwd is resolved once in main; paths built from resolved directories skip another resolve().
+    path = path if path.is_absolute() else path.resolve()
     try:
-        return str(path.resolve().relative_to(cwd.resolve()))
+        return str(path.relative_to(cwd))
     except ValueError:
-        return str(path.resolve())
+        return str(path)
 
 
 def read_csv_rows(path: Path) -> list[dict]:
@@ -61,28 +104,30 @@ def read_csv_rows(path: Path) -> list[dict]:
 def write_csv_rows(path: Path, rows: list[dict]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     with path.open("w", encoding="utf-8", newline="") as handle:
-        writer = csv.DictWriter(handle, fieldnames=HEADER)
-        writer.writeheader()
-        for row in rows:
-            writer.writerow({column: row.get(column, "") for column in HEADER})
+        writer = csv.writer(handle)
+        writer.writerow(HEADER)
+        writer.writerows([row.get(column, "") for column in HEADER] for row in rows)
 
 
-def fetch_json(url: str, timeout_ms: int):
-    request = urllib.request.Request(
-        url,
-        headers={"User-Agent": "repath-mobile-benchmark-bot/1.0 (local dev)"},
-        method="GET",
-    )
-    with urllib.request.urlopen(request, timeout=timeout_ms / 1000.0) as response:
-        status = getattr(response, "status", 200)
-        if status >= 400:
-            raise RuntimeError(f"HTTP {status}")
-        payload = response.read().decode("utf-8")
-        return json.loads(payload)
+def open_commons_connection(timeout_ms: int) -> http.client.HTTPSConnection:
+    # One keep-alive connection is reused for every search so the TCP and TLS handshakes happen once per run.
+    return http.client.HTTPSConnection(COMMONS_HOST, timeout=timeout_ms / 1000.0)
+
 
+def fetch_json(connection: http.client.HTTPSConnection, path: str):
+    connection.request("GET", path, headers=COMMONS_REQUEST_HEADERS)
+    response = connection.getresponse()
+    # The body must be drained before the connection can carry the next request.
+    payload = response.read()
+    if response.status >= 400:
+        raise RuntimeError(f"HTTP {response.status}")
+    if response.getheader("Content-Encoding", "").lower() == "gzip":
+        payload = gzip.decompress(payload)
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either parser's errors.
+    return orjson.loads(payload) if orjson is not None else json.loads(payload)
 
-def find_commons_file_titles(label: str, timeout_ms: int, max_retries: int) -> list[str]:
-    base = "https://commons.wikimedia.org/w/api.php"
+
+def find_commons_file_titles(connection: http.client.HTTPSConnection, label: str, max_retries: int) -> list[str]:
     query = urllib.parse.urlencode(
         {
             "action": "query",
@@ -93,12 +138,12 @@ def find_commons_file_titles(label: str, timeout_ms: int, max_retries: int) -> l
             "srsearch": f"{label} filetype:bitmap",
         }
     )
-    url = f"{base}?{query}"
+    path = f"/w/api.php?{query}"
 
     last_error: Exception | None = None
     for attempt in range(1, max_retries + 1):
         try:
-            payload = fetch_json(url, timeout_ms)
+            payload = fetch_json(connection, path)
             rows = payload.get("query", {}).get("search", []) if isinstance(payload, dict) else []
             titles = []
             for row in rows if isinstance(rows, list) else []:
@@ -106,8 +151,10 @@ def find_commons_file_titles(label: str, timeout_ms: int, max_retries: int) -> l
                 if title:
                     titles.append(title)
             return titles
-        except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError, json.JSONDecodeError, RuntimeError) as error:
+        except (OSError, http.client.HTTPException, json.JSONDecodeError, RuntimeError) as error:
             last_error = error
+            # Drop the socket so the next attempt reconnects instead of reusing a broken stream.
+            connection.close()
             if attempt < max_retries:
                 time.sleep(0.3 * attempt)
 
@@ -116,20 +163,94 @@ def find_commons_file_titles(label: str, timeout_ms: int, max_retries: int) -> l
     raise RuntimeError("request_failed")
 
 
+def load_search_cache(cache_path: Path) -> dict:
+    if not cache_path.exists():
+        return {}
+    try:
+        payload = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    # Expired entries are dropped on load so the file does not grow without bound.
+    cutoff = time.time() - SEARCH_CACHE_TTL_SECONDS
+    return {
+        key: entry
+        for key, entry in payload.items()
+        if isinstance(entry, dict) and isinstance(entry.get("titles"), list) and entry.get("ts", 0) >= cutoff
+    }
+
+
+def save_search_cache(cache_path: Path, cache: dict) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.tmp")
+    tmp_path.write_text(json.dumps(cache) + "\n", encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+
+
+def search_titles(
+    connection: http.client.HTTPSConnection, query_text: str, max_retries: int, cache: dict | None
+) -> list[str]:
+    key = query_text.lower().strip()
+    if cache is not None and key in cache:
+        return cache[key]["titles"]
+    try:
+        titles = find_commons_file_titles(connection, query_text, max_retries=max_retries)
+    except Exception:
+        return []
+    # Only completed searches are cached; failed requests are retried on the next run.
+    if cache is not None:
+        cache[key] = {"ts": int(time.time()), "titles": titles}
+    return titles
+
+
+def prefetch_searches(
+    target_variants: list[Iterator[str]],
+    used_urls: set[str],
+    timeout_ms: int,
+    max_retries: int,
+    workers: int,
+    cache: dict | None,
+) -> list[list[tuple[str, list[str]]]]:
+    # Rows are searched concurrently, each worker thread on its own keep-alive connection.
+    # A row stops at the first variant offering a URL that is not already used, which is
+    # where the serial pass would stop unless an earlier row claims that URL first.
+    # Unconsumed variants stay in the row's generator for the serial pass.
+    local = threading.local()
+    connections = []
+
+    def search_row(variants: Iterator[str]) -> list[tuple[str, list[str]]]:
+        connection = getattr(local, "connection", None)
+        if connection is None:
+            connection = local.connection = open_commons_connection(timeout_ms)
+            connections.append(connection)
+        results = []
+        for query_text in variants:
+            titles = search_titles(connection, query_text, max_retries, cache)
+            results.append((query_text, titles))
+            if any(to_commons_file_path_url(title) not in used_urls for title in titles):
+                break
+        return results
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(search_row, target_variants))
+    finally:
+        for connection in connections:
+            connection.close()
+
+
 def to_commons_file_path_url(file_title: str) -> str:
     normalized = file_title[5:] if file_title.startswith("File:") else file_title
     return f"https://commons.wikimedia.org/wiki/Special:FilePath/{urllib.parse.quote(normalized)}"
 
 
-def unique(values: list[str]) -> list[str]:
+def iter_unique(values: Iterable[str]) -> Iterator[str]:
     seen = set()
-    out = []
     for value in values:
-        if not value or value in seen:
-            continue
-        seen.add(value)
-        out.append(value)
-    return out
+        if value and value not in seen:
+            seen.add(value)
+            yield value
 
 
 def title_case_words(text: str) -> str:
@@ -145,12 +266,11 @@ def title_case_words(text: str) -> str:
 
 def tokenize_label(label: str) -> str:
     value = str(label or "")
-    value = re.sub(r"[()]", " ", value)
-    value = re.sub(r"[,&]", " ", value)
-    value = re.sub(r"\bother than\b", " ", value, flags=re.IGNORECASE)
-    value = re.sub(r"\bmeal kit\b", " ", value, flags=re.IGNORECASE)
-    value = re.sub(r"\bsingle-use\b", " ", value, flags=re.IGNORECASE)
-    value = re.sub(r"\s+", " ", value)
+    value = LABEL_PUNCT_RE.sub(" ", value)
+    value = OTHER_THAN_RE.sub(" ", value)
+    value = MEAL_KIT_RE.sub(" ", value)
+    value = SINGLE_USE_RE.sub(" ", value)
+    value = WHITESPACE_RE.sub(" ", value)
     return value.strip()
 
 
@@ -176,39 +296,48 @@ LABEL_ALIAS_MAP = {
 
 
 def normalize_label_key(label: str) -> str:
-    value = tokenize_label(label).lower()
-    value = re.sub(r"[^a-z0-9 ]+", " ", value)
-    value = re.sub(r"\s+", " ", value)
-    return value.strip()
+    value = tokenize_label(label).lower().encode("ascii", "replace")
+    return b" ".join(value.translate(ALNUM_SEPARATOR_TABLE).split()).decode("ascii")
+
 
+# Keys go through the same normalization as labels, so a lookup is a single dict get.
+NORMALIZED_LABEL_ALIASES = {normalize_label_key(key): aliases for key, aliases in LABEL_ALIAS_MAP.items()}
 
-def build_query_variants(row: dict) -> list[str]:
+
+def iter_query_candidates(row: dict) -> Iterator[str]:
+    # Each group is only computed once the searches for the groups before it have found nothing new.
     label = str(row.get("canonical_label") or "").strip()
+    yield label
+
     item_id = str(row.get("item_id") or "").strip()
-    item_from_id = re.sub(r"[-_]+", " ", item_id).strip()
-    item_from_id = re.sub(r"\bdepth\b", "", item_from_id, flags=re.IGNORECASE).strip()
+    item_from_id = ID_SEPARATOR_RE.sub(" ", item_id).strip()
+    yield DEPTH_RE.sub("", item_from_id).strip()
 
     cleaned_label = tokenize_label(label)
-    cleaned_label = re.sub(r"[/]+", " ", cleaned_label)
-    cleaned_label = re.sub(r"\s+", " ", cleaned_label).strip()
+    cleaned_label = SLASH_RE.sub(" ", cleaned_label)
+    cleaned_label = WHITESPACE_RE.sub(" ", cleaned_label).strip()
+    yield cleaned_label
+    yield title_case_words(cleaned_label)
+
+    yield from NORMALIZED_LABEL_ALIASES.get(normalize_label_key(label), [])
 
     split_parts = []
-    for part in re.split(r"/|\bor\b", label, flags=re.IGNORECASE):
+    for part in LABEL_SPLIT_RE.split(label):
         part = tokenize_label(part)
-        part = re.sub(r"\bplastic film election sign\b", "plastic sign", part, flags=re.IGNORECASE).strip()
-        part = re.sub(r"\bpaperboard election sign\b", "cardboard sign", part, flags=re.IGNORECASE).strip()
+        part = PLASTIC_ELECTION_SIGN_RE.sub("plastic sign", part).strip()
+        part = PAPERBOARD_ELECTION_SIGN_RE.sub("cardboard sign", part).strip()
         if part:
             split_parts.append(part)
+    yield from split_parts
+
+    for part in split_parts:
+        yield BAGS_RE.sub("bag", CONTAINERS_RE.sub("container", part))
+    for part in split_parts:
+        yield f"{part} object"
 
-    singular_parts = [
-        re.sub(r"\bbags\b", "bag", re.sub(r"\bcontainers\b", "container", part, flags=re.IGNORECASE), flags=re.IGNORECASE)
-        for part in split_parts
-    ]
-    generic_hints = [f"{part} object" for part in split_parts]
-    aliases = LABEL_ALIAS_MAP.get(normalize_label_key(label), [])
-    safe_title = title_case_words(cleaned_label)
 
-    return unique([label, item_from_id, cleaned_label, safe_title, *aliases, *split_parts, *singular_parts, *generic_hints])
+def iter_query_variants(row: dict) -> Iterator[str]:
+    return iter_unique(iter_query_candidates(row))
 
 
 def is_previous_no_match(row: dict) -> bool:
@@ -217,22 +346,30 @@ def is_previous_no_match(row: dict) -> bool:
     return source == "wikimedia_commons_search" and "no_match" in notes
 
 
-def merge_rows(existing_rows: list[dict], updates: list[dict]) -> list[dict]:
-    merged = {}
-    for row in existing_rows:
-        name = str(row.get("name") or "").strip()
+def index_rows(rows: list[dict]) -> tuple[dict[str, dict], set[str]]:
+    # Rows come from read_csv_rows, so every HEADER field is present and already stripped.
+    by_name = {}
+    used_urls = set()
+    for row in rows:
+        name = row["name"]
         if name:
-            merged[name] = row
+            by_name[name] = row
+        url = row["url"]
+        if url:
+            used_urls.add(url)
+    return by_name, used_urls
+
+
+def merge_rows(by_name: dict[str, dict], updates: list[dict]) -> list[dict]:
     for row in updates:
         name = str(row.get("name") or "").strip()
         if name:
-            merged[name] = row
-    return [merged[key] for key in sorted(merged.keys(), key=lambda value: value.lower())]
+            by_name[name] = row
+    return [by_name[key] for key in sorted(by_name, key=str.lower)]
 
 
-def main() -> None:
-    args = parse_args()
-    cwd = Path.cwd()
+def run_online_suggestion(args: argparse.Namespace) -> dict:
+    cwd = Path.cwd().resolve()
 
     in_path = Path(args.input).resolve()
     out_path = Path(args.out).resolve()
@@ -240,10 +377,10 @@ def main() -> None:
         raise SystemExit(f"Input CSV not found: {in_path}")
 
     rows = read_csv_rows(in_path)
-    existing_rows = read_csv_rows(Path(args.merge_into).resolve()) if args.merge_into else rows
-
-    used_urls = {str(row.get("url") or "").strip() for row in existing_rows if str(row.get("url") or "").strip()}
-    unresolved = [row for row in rows if not str(row.get("url") or "").strip() and str(row.get("canonical_label") or "").strip()]
+    merge_path = Path(args.merge_into).resolve() if args.merge_into else None
+    existing_rows = read_csv_rows(merge_path) if merge_path and merge_path != in_path else rows
+    existing_by_name, used_urls = index_rows(existing_rows)
+    unresolved = [row for row in rows if not row["url"] and row["canonical_label"]]
 
     skipped_previous = sum(1 for row in unresolved if is_previous_no_match(row))
     pool = unresolved if args.include_previous_failures else [row for row in unresolved if not is_previous_no_match(row)]
@@ -252,18 +389,30 @@ def main() -> None:
 
     updates = []
     no_match_count = 0
+    search_cache_path = None if args.no_search_cache else Path(args.search_cache).resolve()
+    search_cache = load_search_cache(search_cache_path) if search_cache_path else None
+
+    target_variants = [iter_query_variants(row) for row in targets]
+    prefetched = prefetch_searches(
+        target_variants,
+        used_urls,
+        args.timeout_ms,
+        args.max_retries,
+        min(args.workers, len(targets) or 1),
+        search_cache,
+    )
+    # Matches are claimed in row order, so URL dedup needs no locking and the output matches a serial run.
+    # Variants beyond what was prefetched are only searched when earlier rows took every prefetched URL.
+    connection = open_commons_connection(args.timeout_ms)
 
-    for row in targets:
-        variants = build_query_variants(row)
+    for row, variants, searched in zip(targets, target_variants, prefetched):
         title = None
         matched_query = ""
 
-        for query_text in variants:
-            try:
-                titles = find_commons_file_titles(query_text, timeout_ms=args.timeout_ms, max_retries=args.max_retries)
-            except Exception:
-                continue
-
+        remaining = (
+            (query_text, search_titles(connection, query_text, args.max_retries, search_cache)) for query_text in variants
+        )
+        for query_text, titles in chain(searched, remaining):
             for candidate_title in titles:
                 candidate_url = to_commons_file_path_url(candidate_title)
                 if candidate_url in used_urls:
@@ -289,34 +438,36 @@ def main() -> None:
             no_match_count += 1
             updates.append({**row, "source": "wikimedia_commons_search", "notes": "no_match"})
 
+    connection.close()
+    if search_cache_path:
+        save_search_cache(search_cache_path, search_cache)
     write_csv_rows(out_path, updates)
 
     merged_count = None
     merged_into = None
-    if args.merge_into:
-        merge_path = Path(args.merge_into).resolve()
-        merged = merge_rows(read_csv_rows(merge_path), updates)
+    if merge_path:
+        merged = merge_rows(existing_by_name, updates)
         write_csv_rows(merge_path, merged)
         merged_count = len(merged)
         merged_into = rel_or_abs(merge_path, cwd)
 
+    return {
+        "attempted": len(targets),
+        "offset": args.offset,
+        "skipped_previously_attempted": skipped_previous,
+        "unresolved_pool": len(pool),
+        "matched_rows": sum(1 for row in updates if str(row.get("url") or "").strip()),
+        "no_match_rows": no_match_count,
+        "output": rel_or_abs(out_path, cwd),
+        "merged_into": merged_into,
+        "merged_row_count": merged_count,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    summary = run_online_suggestion(parse_args(argv))
     print("Online benchmark suggestions generated")
-    print(
-        json.dumps(
-            {
-                "attempted": len(targets),
-                "offset": args.offset,
-                "skipped_previously_attempted": skipped_previous,
-                "unresolved_pool": len(pool),
-                "matched_rows": sum(1 for row in updates if str(row.get("url") or "").strip()),
-                "no_match_rows": no_match_count,
-                "output": rel_or_abs(out_path, cwd),
-                "merged_into": merged_into,
-                "merged_row_count": merged_count,
-            },
-            indent=2,
-        )
-    )
+    print(json.dumps(summary, indent=2))
 
 
 if __name__ == "__main__":
@@ -1,10 +1,15 @@
 #!/usr/bin/env python3
 import argparse
 import json
-import subprocess
 import sys
 from pathlib import Path
 
+SCRIPT_DIR = Path(__file__).resolve().parent
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+from suggest_benchmark_online import main as run_online_pass
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
@@ -31,10 +36,8 @@ def parse_args() -> argparse.Namespace:
 
 
 def run_pass(offset: int, args: argparse.Namespace) -> None:
-    script = Path(__file__).resolve().parent / "suggest_benchmark_online.py"
-    cmd = [
-        sys.executable,
-        str(script),
+    # Passes run in-process, so the interpreter starts once for the whole bulk run.
+    argv = [
         "--merge-into",
         "test/benchmarks/benchmark-labeled.csv",
         "--out",
@@ -48,9 +51,10 @@ def run_pass(offset: int, args: argparse.Namespace) -> None:
         "--max-retries",
         str(args.max_retries),
     ]
-    result = subprocess.run(cmd, check=False)
-    if result.returncode != 0:
-        raise SystemExit(f"online suggestion pass failed at offset={offset}")
+    try:
+        run_online_pass(argv)
+    except SystemExit as error:
+        raise SystemExit(f"online suggestion pass failed at offset={offset}: {error}") from error
 
 
 def main() -> None:
@@ -1,17 +1,27 @@
 #!/usr/bin/env python3
 import argparse
 import csv
+import gzip
+import http.client
 import json
+import os
 import re
+import threading
 import time
-import urllib.error
 import urllib.parse
-import urllib.request
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
 HEADER = ["name", "url", "item_id", "canonical_label", "source", "notes"]
 DEFAULT_UA = "repath-mobile-negative-bot/1.0"
+COMMONS_HOST = "commons.wikimedia.org"
+COMMONS_REQUEST_HEADERS = {"User-Agent": DEFAULT_UA, "Accept-Encoding": "gzip", "Connection": "keep-alive"}
+QUERY_HINT_RE = re.compile(r"query_hint=([^;]+)", re.IGNORECASE)
+TODO_NEGATIVE_PREFIX_RE = re.compile(r"^todo_negative_")
+TRAILING_INDEX_RE = re.compile(r"_[0-9]+$")
+SEPARATOR_RE = re.compile(r"[-_]+")
 
 
 def parse_args() -> argparse.Namespace:
@@ -22,7 +32,9 @@ def parse_args() -> argparse.Namespace:
             "[--manifest test/benchmarks/municipal-benchmark-manifest-v2.json] "
             "[--input test/benchmarks/benchmark-labeled.csv] "
             "[--out test/benchmarks/benchmark-labeled.negatives.csv] "
-            "[--merge-into test/benchmarks/benchmark-labeled.csv] [--limit 20]"
+            "[--merge-into test/benchmarks/benchmark-labeled.csv] [--limit 20] [--workers 4] "
+            "[--search-cache test/benchmarks/.commons_negative_search_cache.json] [--cache-ttl-days 7] "
+            "[--no-search-cache]"
         ),
     )
     parser.add_argument("--manifest", default=str(Path("test") / "benchmarks" / "municipal-benchmark-manifest-v2.json"))
@@ -32,10 +44,20 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--limit", type=int, default=20)
     parser.add_argument("--timeout-ms", type=int, default=15000)
     parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent Commons searches.")
+    parser.add_argument(
+        "--search-cache",
+        default=str(Path("test") / "benchmarks" / ".commons_negative_search_cache.json"),
+        help="Commons search results reused across runs.",
+    )
+    parser.add_argument("--cache-ttl-days", type=float, default=7, help="Days before a cached search is repeated.")
+    parser.add_argument("--no-search-cache", action="store_true", help="Query Commons for every search.")
     args = parser.parse_args()
     args.limit = args.limit if args.limit and args.limit > 0 else 20
     args.timeout_ms = args.timeout_ms if args.timeout_ms and args.timeout_ms >= 1000 else 15000
     args.max_retries = args.max_retries if args.max_retries and args.max_retries >= 1 else 3
+    args.workers = args.workers if args.workers and args.workers >= 1 else 4
+    args.cache_ttl_days = args.cache_ttl_days if args.cache_ttl_days and args.cache_ttl_days > 0 else 7
     return args
 
 
@@ -50,12 +72,12 @@ def rel_or_abs(path: Path, cwd: Path) -> str:
         return str(path.resolve())
 
 
-def read_csv_rows(path: Path) -> list[dict]:
+def iter_csv_rows(path: Path) -> Iterator[dict]:
     if not path.exists():
-        return []
+        return
     with path.open("r", encoding="utf-8", newline="") as handle:
-        reader = csv.DictReader(handle)
-        return [{column: str((row or {}).get(column, "")).strip() for column in HEADER} for row in reader]
+        for row in csv.DictReader(handle):
+            yield {column: str((row or {}).get(column, "")).strip() for column in HEADER}
 
 
 def write_csv_rows(path: Path, rows: list[dict]) -> None:
@@ -67,7 +89,7 @@ def write_csv_rows(path: Path, rows: list[dict]) -> None:
             writer.writerow({column: row.get(column, "") for column in HEADER})
 
 
-def merge_rows(existing_rows: list[dict], updates: list[dict]) -> list[dict]:
+def merge_rows(existing_rows: Iterable[dict], updates: list[dict]) -> list[dict]:
     merged = {}
     for row in existing_rows:
         name = str(row.get("name") or "").strip()
@@ -80,17 +102,22 @@ def merge_rows(existing_rows: list[dict], updates: list[dict]) -> list[dict]:
     return [merged[key] for key in sorted(merged.keys(), key=lambda value: value.lower())]
 
 
-def fetch_json(url: str, timeout_ms: int):
-    request = urllib.request.Request(url, headers={"User-Agent": DEFAULT_UA}, method="GET")
-    with urllib.request.urlopen(request, timeout=timeout_ms / 1000.0) as response:
-        status = getattr(response, "status", 200)
-        if status >= 400:
-            raise RuntimeError(f"HTTP {status}")
-        return json.loads(response.read().decode("utf-8"))
+def open_commons_connection(timeout_ms: int) -> http.client.HTTPSConnection:
+    return http.client.HTTPSConnection(COMMONS_HOST, timeout=timeout_ms / 1000.0)
+
 
+def fetch_json(connection: http.client.HTTPSConnection, path: str):
+    connection.request("GET", path, headers=COMMONS_REQUEST_HEADERS)
+    response = connection.getresponse()
+    payload = response.read()
+    if response.status >= 400:
+        raise RuntimeError(f"HTTP {response.status}")
+    if response.getheader("Content-Encoding", "").lower() == "gzip":
+        payload = gzip.decompress(payload)
+    return json.loads(payload)
 
-def search_commons(query: str, timeout_ms: int, max_retries: int) -> list[str]:
-    base = "https://commons.wikimedia.org/w/api.php"
+
+def search_commons(connection: http.client.HTTPSConnection, query: str, max_retries: int) -> list[str]:
     params = urllib.parse.urlencode(
         {
             "action": "query",
@@ -101,12 +128,12 @@ def search_commons(query: str, timeout_ms: int, max_retries: int) -> list[str]:
             "srsearch": f"{query} filetype:bitmap",
         }
     )
-    url = f"{base}?{params}"
+    path = f"/w/api.php?{params}"
 
     last_error: Exception | None = None
     for attempt in range(1, max_retries + 1):
         try:
-            payload = fetch_json(url, timeout_ms)
+            payload = fetch_json(connection, path)
             rows = payload.get("query", {}).get("search", []) if isinstance(payload, dict) else []
             titles = []
             for row in rows if isinstance(rows, list) else []:
@@ -114,8 +141,9 @@ def search_commons(query: str, timeout_ms: int, max_retries: int) -> list[str]:
                 if title:
                     titles.append(title)
             return titles
-        except (urllib.error.URLError, urllib.error.HTTPError, TimeoutError, json.JSONDecodeError, RuntimeError) as error:
+        except (OSError, http.client.HTTPException, json.JSONDecodeError, RuntimeError) as error:
             last_error = error
+            connection.close()
             if attempt < max_retries:
                 time.sleep(0.3 * attempt)
 
@@ -124,6 +152,66 @@ def search_commons(query: str, timeout_ms: int, max_retries: int) -> list[str]:
     raise RuntimeError("request_failed")
 
 
+def load_search_cache(cache_path: Path, ttl_seconds: float) -> dict:
+    if not cache_path.exists():
+        return {}
+    try:
+        payload = load_json(cache_path)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    cutoff = time.time() - ttl_seconds
+    return {
+        key: entry
+        for key, entry in payload.items()
+        if isinstance(entry, dict) and isinstance(entry.get("titles"), list) and entry.get("ts", 0) >= cutoff
+    }
+
+
+def save_search_cache(cache_path: Path, cache: dict) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.tmp")
+    tmp_path.write_text(json.dumps(cache) + "\n", encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+
+
+def search_all(
+    hints: list[str], timeout_ms: int, max_retries: int, workers: int, cache: dict | None
+) -> list[list[str] | None]:
+    # One keep-alive connection per worker thread; failed searches come back as None and are not cached.
+    # Entries that share a hint (up to case and edge whitespace) share one search.
+    local = threading.local()
+    connections = []
+    keys = [hint.lower().strip() for hint in hints]
+    distinct: dict[str, str] = {}
+    for key, hint in zip(keys, hints):
+        distinct.setdefault(key, hint)
+
+    def search(key: str, hint: str) -> list[str] | None:
+        if cache is not None and key in cache:
+            return cache[key]["titles"]
+        connection = getattr(local, "connection", None)
+        if connection is None:
+            connection = local.connection = open_commons_connection(timeout_ms)
+            connections.append(connection)
+        try:
+            titles = search_commons(connection, hint, max_retries=max_retries)
+        except Exception:
+            return None
+        if cache is not None:
+            cache[key] = {"ts": int(time.time()), "titles": titles}
+        return titles
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = dict(zip(distinct, executor.map(search, distinct, distinct.values())))
+        return [results[key] for key in keys]
+    finally:
+        for connection in connections:
+            connection.close()
+
+
 def to_commons_file_path_url(title: str) -> str:
     normalized = title[5:] if title.startswith("File:") else title
     return f"https://commons.wikimedia.org/wiki/Special:FilePath/{urllib.parse.quote(normalized)}"
@@ -139,14 +227,14 @@ def is_negative(entry: dict) -> bool:
 
 def query_hint(entry: dict) -> str:
     notes = str((entry or {}).get("notes") or "")
-    match = re.search(r"query_hint=([^;]+)", notes, flags=re.IGNORECASE)
+    match = QUERY_HINT_RE.search(notes)
     if match and match.group(1):
         return match.group(1).strip()
 
     name = str((entry or {}).get("name") or "")
-    name = re.sub(r"^todo_negative_", "", name)
-    name = re.sub(r"_[0-9]+$", "", name)
-    name = re.sub(r"[-_]+", " ", name).strip()
+    name = TODO_NEGATIVE_PREFIX_RE.sub("", name)
+    name = TRAILING_INDEX_RE.sub("", name)
+    name = SEPARATOR_RE.sub(" ", name).strip()
     return name or "street scene"
 
 
@@ -155,8 +243,7 @@ def main() -> None:
     cwd = Path.cwd()
 
     manifest = load_json(Path(args.manifest).resolve())
-    in_rows = read_csv_rows(Path(args.input).resolve())
-    used_urls = {str(row.get("url") or "").strip() for row in in_rows if str(row.get("url") or "").strip()}
+    used_urls = {row["url"] for row in iter_csv_rows(Path(args.input).resolve()) if row["url"]}
 
     images = manifest.get("images") if isinstance(manifest, dict) else []
     images = images if isinstance(images, list) else []
@@ -169,14 +256,20 @@ def main() -> None:
     ][: args.limit]
 
     updates = []
+    hints = [query_hint(entry) for entry in negatives]
 
-    for entry in negatives:
-        name = str(entry.get("name") or "").strip()
-        hint = query_hint(entry)
+    # Searches run concurrently; results are consumed in manifest order so URL picks stay deterministic.
+    search_cache_path = None if args.no_search_cache else Path(args.search_cache).resolve()
+    search_cache = load_search_cache(search_cache_path, args.cache_ttl_days * 86400) if search_cache_path else None
+    results = search_all(
+        hints, args.timeout_ms, args.max_retries, min(args.workers, len(negatives) or 1), search_cache
+    )
+    if search_cache_path:
+        save_search_cache(search_cache_path, search_cache)
 
-        try:
-            titles = search_commons(hint, timeout_ms=args.timeout_ms, max_retries=args.max_retries)
-        except Exception:
+    for entry, hint, titles in zip(negatives, hints, results):
+        name = str(entry.get("name") or "").strip()
+        if titles is None:
             continue
 
         picked_url = ""
@@ -211,7 +304,7 @@ def main() -> None:
     merged_into = None
     if args.merge_into:
         merge_path = Path(args.merge_into).resolve()
-        merged = merge_rows(read_csv_rows(merge_path), updates)
+        merged = merge_rows(iter_csv_rows(merge_path), updates)
         write_csv_rows(merge_path, merged)
         merged_count = len(merged)
         merged_into = rel_or_abs(merge_path, cwd)
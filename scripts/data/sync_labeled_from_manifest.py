@@ -2,6 +2,7 @@
 import argparse
 import csv
 import json
+from collections.abc import Iterator
 from pathlib import Path
 
 
@@ -45,19 +46,19 @@ def rel_or_abs(path: Path, cwd: Path) -> str:
         return str(path)
 
 
-def read_csv_rows(path: Path) -> list[dict]:
+def iter_csv_rows(path: Path) -> Iterator[dict]:
     if not path.exists():
-        return []
-    lines = path.read_text(encoding="utf-8").splitlines()
-    lines = [line for line in lines if line.strip()]
-    if len(lines) <= 1:
-        return []
-
-    rows = []
-    for line in lines[1:]:
-        cols = next(csv.reader([line]))
-        rows.append(
-            {
+        return
+    with path.open("r", encoding="utf-8", newline="") as handle:
+        reader = csv.reader(handle)
+        has_header = False
+        for cols in reader:
+            if not cols or (len(cols) == 1 and not cols[0].strip()):
+                continue
+            if not has_header:
+                has_header = True
+                continue
+            yield {
                 "name": str(cols[0] if len(cols) > 0 else "").strip(),
                 "url": str(cols[1] if len(cols) > 1 else "").strip(),
                 "item_id": str(cols[2] if len(cols) > 2 else "").strip(),
@@ -65,8 +66,6 @@ def read_csv_rows(path: Path) -> list[dict]:
                 "source": str(cols[4] if len(cols) > 4 else "").strip(),
                 "notes": str(cols[5] if len(cols) > 5 else "").strip(),
             }
-        )
-    return rows
 
 
 def write_csv_rows(path: Path, rows: list[dict]) -> None:
@@ -116,9 +115,14 @@ def main() -> None:
     manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
     images = manifest.get("images") if isinstance(manifest, dict) else []
     images = images if isinstance(images, list) else []
-    rows = read_csv_rows(input_path)
 
-    row_map = {row["name"]: row for row in rows if row.get("name")}
+    # Rows stream straight into the name index; only the count of input rows is kept besides it.
+    rows_before = 0
+    row_map = {}
+    for row in iter_csv_rows(input_path):
+        rows_before += 1
+        if row["name"]:
+            row_map[row["name"]] = row
 
     added = 0
     enriched = 0
@@ -176,7 +180,7 @@ def main() -> None:
     print(
         json.dumps(
             {
-                "rows_before": len(rows),
+                "rows_before": rows_before,
                 "rows_after": len(merged),
                 "added": added,
                 "enriched": enriched,
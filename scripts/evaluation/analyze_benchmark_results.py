@@ -1,10 +1,29 @@
 #!/usr/bin/env python3
 import argparse
 import csv
+import heapq
 import json
+import re
+import sys
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
+from operator import itemgetter
 from pathlib import Path
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+try:
+    import ijson
+except Exception:
+    ijson = None
+
+CSV_SPECIAL_RE = re.compile(r'[,"\r\n]')
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Analyze benchmark results and build retraining priority outputs.")
@@ -34,8 +53,97 @@ def rel_or_abs(path: Path, cwd: Path) -> str:
         return str(path)
 
 
-def sorted_entries(counter: dict[str, int]) -> list[tuple[str, int]]:
-    return sorted(counter.items(), key=lambda pair: pair[1], reverse=True)
+def load_json(file_path: Path):
+    if orjson is not None:
+        return orjson.loads(file_path.read_bytes())
+    return json.loads(file_path.read_text(encoding="utf-8"))
+
+
+def stream_result_rows(file_path: Path, loaded: dict) -> Iterator:
+    # A single ijson.parse pass: rows under results.item are yielded as they complete,
+    # and the top-level summary is built from the same event stream into loaded["summary"].
+    builder = None
+    target = ""
+    depth = 0
+    with file_path.open("rb") as handle:
+        for prefix, event, value in ijson.parse(handle, use_float=True):
+            if builder is None:
+                if prefix not in ("summary", "results.item") or event in ("map_key", "end_map", "end_array"):
+                    continue
+                if event not in ("start_map", "start_array"):
+                    if prefix == "results.item":
+                        yield value
+                    elif "summary" not in loaded:
+                        loaded["summary"] = value
+                    continue
+                builder = ijson.ObjectBuilder()
+                target = prefix
+            builder.event(event, value)
+            if event in ("start_map", "start_array"):
+                depth += 1
+            elif event in ("end_map", "end_array"):
+                depth -= 1
+            if depth == 0:
+                if target == "results.item":
+                    yield builder.value
+                elif "summary" not in loaded:
+                    loaded["summary"] = builder.value
+                builder = None
+
+
+def load_results(file_path: Path, loaded: dict) -> Iterable:
+    # The streamed summary is only complete once the rows have been consumed.
+    if ijson is not None:
+        return stream_result_rows(file_path, loaded)
+
+    payload = load_json(file_path)
+    if not isinstance(payload, dict):
+        loaded["summary"] = {}
+        return []
+    results = payload.get("results")
+    loaded["summary"] = payload.get("summary", {})
+    return results if isinstance(results, list) else []
+
+
+def write_json(file_path: Path, payload) -> None:
+    if orjson is not None:
+        file_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
+    with file_path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+        handle.write("\n")
+
+
+@dataclass(slots=True)
+class PriorityRow:
+    label: str
+    priority_score: float
+    expected_count: int
+    miss_count: int
+    hit_count: int
+    false_positive_count: int
+    hit_rate: float
+    recommended_action: str
+
+
+def label_set(values) -> frozenset[str]:
+    return frozenset(label for label in (sys.intern(str(v).strip()) for v in values) if label)
+
+
+def add_counts(counter: Counter[str], keys: Iterable[str], occurrences: int) -> None:
+    for key in keys:
+        counter[key] += occurrences
+
+
+def pair_key(expected: str, predicted: str, cache: dict[tuple[str, str], str]) -> str:
+    key = cache.get((expected, predicted))
+    if key is None:
+        key = cache[(expected, predicted)] = f"{expected} -> {predicted}"
+    return key
+
+
+def top_entries(counter: Counter[str], limit: int) -> list[tuple[str, int]]:
+    return heapq.nlargest(limit, counter.items(), key=itemgetter(1))
 
 
 def write_priority_csv(path: Path, rows: list[dict]) -> None:
@@ -52,24 +160,32 @@ def write_priority_csv(path: Path, rows: list[dict]) -> None:
         "recommended_action",
         "notes",
     ]
-    with path.open("w", encoding="utf-8", newline="") as handle:
+    data = [
+        [
+            idx,
+            row.get("label", ""),
+            row.get("priority_score", 0),
+            row.get("expected_count", 0),
+            row.get("miss_count", 0),
+            row.get("hit_count", 0),
+            row.get("false_positive_count", 0),
+            row.get("hit_rate", 0),
+            row.get("recommended_action", ""),
+            "",
+        ]
+        for idx, row in enumerate(rows, start=1)
+    ]
+    cells = [[str(value) for value in line] for line in data]
+    if not any(CSV_SPECIAL_RE.search(value) for line in cells for value in line):
+        # Nothing needs quoting, so skip csv.writer and emit the same bytes in one write.
+        lines = [",".join(header)] + [",".join(line) for line in cells]
+        path.write_text("\r\n".join(lines) + "\r\n", encoding="utf-8", newline="")
+        return
+
+    with path.open("w", encoding="utf-8", newline="", buffering=1 << 20) as handle:
         writer = csv.writer(handle)
         writer.writerow(header)
-        for idx, row in enumerate(rows, start=1):
-            writer.writerow(
-                [
-                    idx,
-                    row.get("label", ""),
-                    row.get("priority_score", 0),
-                    row.get("expected_count", 0),
-                    row.get("miss_count", 0),
-                    row.get("hit_count", 0),
-                    row.get("false_positive_count", 0),
-                    row.get("hit_rate", 0),
-                    row.get("recommended_action", ""),
-                    "",
-                ]
-            )
+        writer.writerows(data)
 
 
 def main() -> None:
@@ -85,47 +201,51 @@ def main() -> None:
     if not input_path.exists():
         raise SystemExit(f"Input results file not found: {input_path}")
 
-    payload = json.loads(input_path.read_text(encoding="utf-8"))
-    results = payload.get("results") if isinstance(payload, dict) else []
-    if not isinstance(results, list):
-        results = []
+    loaded: dict = {}
+    results = load_results(input_path, loaded)
+    result_rows = 0
 
-    expected_count: dict[str, int] = {}
-    hit_count: dict[str, int] = {}
-    miss_count: dict[str, int] = {}
-    fp_count: dict[str, int] = {}
-    pair_fp: dict[str, int] = {}
+    expected_count: Counter[str] = Counter()
+    hit_count: Counter[str] = Counter()
+    miss_count: Counter[str] = Counter()
+    fp_count: Counter[str] = Counter()
+    pair_fp: Counter[str] = Counter()
+    pair_keys: dict[tuple[str, str], str] = {}
 
+    # Benchmark rows repeat the same label sets heavily, so tally each distinct
+    # (expected, predicted) combination once, weighted by how often it occurs.
+    combos: Counter[tuple[frozenset[str], frozenset[str]]] = Counter()
     for row in results:
+        result_rows += 1
         if not isinstance(row, dict):
             continue
-        expected_any = row.get("expected_any") or []
-        predicted_labels = row.get("predicted_labels") or []
-
-        expected = {
-            str(v).strip() for v in expected_any if str(v).strip()
-        }
-        predicted = {
-            str(v).strip() for v in predicted_labels if str(v).strip()
-        }
-
-        for label in expected:
-            expected_count[label] = expected_count.get(label, 0) + 1
-            if label in predicted:
-                hit_count[label] = hit_count.get(label, 0) + 1
-            else:
-                miss_count[label] = miss_count.get(label, 0) + 1
-
-        for pred_label in predicted:
-            if pred_label in expected:
-                continue
-            fp_count[pred_label] = fp_count.get(pred_label, 0) + 1
-            for exp_label in expected:
-                key = f"{exp_label} -> {pred_label}"
-                pair_fp[key] = pair_fp.get(key, 0) + 1
+        expected = label_set(row.get("expected_any") or [])
+        predicted = label_set(row.get("predicted_labels") or [])
+        if expected or predicted:
+            combos[(expected, predicted)] += 1
+
+    for (expected, predicted), occurrences in combos.items():
+        if not predicted:
+            add_counts(expected_count, expected, occurrences)
+            add_counts(miss_count, expected, occurrences)
+            continue
+
+        false_positives = predicted - expected
+        add_counts(fp_count, false_positives, occurrences)
+        if not expected:
+            continue
+
+        add_counts(expected_count, expected, occurrences)
+        add_counts(hit_count, expected & predicted, occurrences)
+        add_counts(miss_count, expected - predicted, occurrences)
+        add_counts(
+            pair_fp,
+            (pair_key(exp_label, pred_label, pair_keys) for pred_label in false_positives for exp_label in expected),
+            occurrences,
+        )
 
     labels = set(expected_count.keys()) | set(fp_count.keys())
-    rows: list[dict] = []
+    rows: list[PriorityRow] = []
     for label in labels:
         expected = expected_count.get(label, 0)
         miss = miss_count.get(label, 0)
@@ -136,53 +256,53 @@ def main() -> None:
         action = "collect_more_positives" if miss >= fp else "add_hard_negatives"
 
         rows.append(
-            {
-                "label": label,
-                "priority_score": round(priority, 2),
-                "expected_count": expected,
-                "miss_count": miss,
-                "hit_count": hit,
-                "false_positive_count": fp,
-                "hit_rate": round(hit_rate, 4),
-                "recommended_action": action,
-            }
+            PriorityRow(
+                label=label,
+                priority_score=round(priority, 2),
+                expected_count=expected,
+                miss_count=miss,
+                hit_count=hit,
+                false_positive_count=fp,
+                hit_rate=round(hit_rate, 4),
+                recommended_action=action,
+            )
         )
 
-    rows.sort(
-        key=lambda r: (
-            -float(r.get("priority_score", 0)),
-            -int(r.get("miss_count", 0)),
-            -int(r.get("false_positive_count", 0)),
+    top_rows = [
+        asdict(row)
+        for row in heapq.nsmallest(
+            args.top,
+            rows,
+            key=lambda r: (-r.priority_score, -r.miss_count, -r.false_positive_count),
         )
-    )
-    top_rows = rows[: args.top]
+    ]
 
     out_payload = {
         "source": rel_or_abs(input_path, cwd),
         "generated_at": datetime.now(timezone.utc).isoformat(),
-        "summary": payload.get("summary", {}) if isinstance(payload, dict) else {},
+        "summary": loaded.get("summary", {}),
         "counts": {
-            "result_rows": len(results),
+            "result_rows": result_rows,
             "expected_labels": len(expected_count),
             "false_positive_labels": len(fp_count),
         },
         "top_missed_labels": [
             {"label": label, "count": count}
-            for label, count in sorted_entries(miss_count)[: args.top]
+            for label, count in top_entries(miss_count, args.top)
         ],
         "top_false_positive_labels": [
             {"label": label, "count": count}
-            for label, count in sorted_entries(fp_count)[: args.top]
+            for label, count in top_entries(fp_count, args.top)
         ],
         "top_confusion_pairs": [
             {"pair": pair, "count": count}
-            for pair, count in sorted_entries(pair_fp)[: args.top]
+            for pair, count in top_entries(pair_fp, args.top)
         ],
         "priority_table": top_rows,
     }
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(out_payload, indent=2) + "\n", encoding="utf-8")
+    write_json(out_path, out_payload)
     write_priority_csv(template_path, top_rows)
 
     print("Benchmark error analysis generated")
@@ -192,7 +312,7 @@ def main() -> None:
                 "input": rel_or_abs(input_path, cwd),
                 "output": rel_or_abs(out_path, cwd),
                 "template_output": rel_or_abs(template_path, cwd),
-                "rows_analyzed": len(results),
+                "rows_analyzed": result_rows,
                 "priority_rows": len(top_rows),
             },
             indent=2,
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import argparse
 import json
+from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -36,17 +37,6 @@ def load_json(path: Path):
     return json.loads(path.read_text(encoding="utf-8"))
 
 
-def unique(values: list[str]) -> list[str]:
-    seen = set()
-    out = []
-    for value in values:
-        if value in seen:
-            continue
-        seen.add(value)
-        out.append(value)
-    return out
-
-
 def median(values: list[int]) -> float:
     if not values:
         return 0
@@ -71,23 +61,6 @@ def build_taxonomy_index(taxonomy: dict) -> dict[str, dict]:
     return out
 
 
-def label_for_entry(entry: dict) -> str:
-    expected_any = entry.get("expected_any") if isinstance(entry, dict) else []
-    expected_all = entry.get("expected_all") if isinstance(entry, dict) else []
-    expected_any = expected_any if isinstance(expected_any, list) else []
-    expected_all = expected_all if isinstance(expected_all, list) else []
-
-    if expected_any:
-        return str(expected_any[0] or "").strip()
-    if expected_all:
-        return str(expected_all[0] or "").strip()
-    return ""
-
-
-def increment(counter: dict[str, int], key: str) -> None:
-    counter[key] = counter.get(key, 0) + 1
-
-
 def to_sorted_entries(counter: dict[str, int]) -> list[dict]:
     keys = sorted(counter.keys(), key=lambda key: (-counter[key], key))
     return [{"key": key, "count": counter[key]} for key in keys]
@@ -113,72 +86,73 @@ def main() -> None:
     images = images if isinstance(images, list) else []
 
     taxonomy_by_label = build_taxonomy_index(taxonomy)
+    # Known labels map to their (possibly empty) primary outcome; unknown labels are absent.
+    primary_by_label = {
+        label: str(row.get("primary_outcome") or "").strip() for label, row in taxonomy_by_label.items()
+    }
 
-    ready_entries = [
-        entry
-        for entry in images
-        if isinstance(entry, dict) and str(entry.get("status") or "").lower() == "ready"
-    ]
-    todo_entries = [
-        entry
-        for entry in images
-        if isinstance(entry, dict) and str(entry.get("status") or "").lower() == "todo"
-    ]
-    negative_entries = [
-        entry
-        for entry in images
-        if isinstance(entry, dict)
-        and len(entry.get("expected_any") if isinstance(entry.get("expected_any"), list) else []) == 0
-        and len(entry.get("expected_all") if isinstance(entry.get("expected_all"), list) else []) == 0
-    ]
-
-    seen_names: dict[str, int] = {}
-    seen_urls: dict[str, int] = {}
-
+    ready_count = 0
+    todo_count = 0
+    negative_count = 0
+    missing_url_total = 0
+    missing_url_ready = 0
+    seen_names: Counter[str] = Counter()
+    seen_urls: Counter[str] = Counter()
+    class_counts_ready: Counter[str] = Counter()
+    class_counts_total: Counter[str] = Counter()
+    outcome_counts_ready: Counter[str] = Counter()
+    outcome_counts_total: Counter[str] = Counter()
+    unknown_labels: set[str] = set()
+
+    # One pass fills every count; expected_any/expected_all are read once per entry.
     for entry in images:
         if not isinstance(entry, dict):
             continue
+        status = str(entry.get("status") or "").lower()
+        is_ready = status == "ready"
+        if is_ready:
+            ready_count += 1
+        elif status == "todo":
+            todo_count += 1
+
         name = str(entry.get("name") or "").strip()
         url = str(entry.get("url") or "").strip()
         if name:
-            seen_names[name] = seen_names.get(name, 0) + 1
+            seen_names[name] += 1
         if url:
-            seen_urls[url] = seen_urls.get(url, 0) + 1
-
-    duplicate_name_map = {name: count for name, count in seen_names.items() if count > 1}
-    duplicate_url_map = {url: count for url, count in seen_urls.items() if count > 1}
-
-    missing_url_ready = [entry for entry in ready_entries if not str(entry.get("url") or "").strip()]
-    missing_url_total = [entry for entry in images if isinstance(entry, dict) and not str(entry.get("url") or "").strip()]
-
-    class_counts_ready: dict[str, int] = {}
-    class_counts_total: dict[str, int] = {}
-    outcome_counts_ready: dict[str, int] = {}
-    outcome_counts_total: dict[str, int] = {}
-    unknown_labels: list[str] = []
-
-    for entry in images:
-        if not isinstance(entry, dict):
+            seen_urls[url] += 1
+        else:
+            missing_url_total += 1
+            if is_ready:
+                missing_url_ready += 1
+
+        expected_any = entry.get("expected_any")
+        expected_all = entry.get("expected_all")
+        expected_any = expected_any if isinstance(expected_any, list) else []
+        expected_all = expected_all if isinstance(expected_all, list) else []
+        expected = expected_any or expected_all
+        if not expected:
+            negative_count += 1
             continue
-        label = label_for_entry(entry)
+
+        label = str(expected[0] or "").strip()
         if not label:
             continue
 
-        increment(class_counts_total, label)
-        row = taxonomy_by_label.get(label)
-        if row:
-            primary = str(row.get("primary_outcome") or "").strip()
+        class_counts_total[label] += 1
+        primary = primary_by_label.get(label)
+        if primary is None:
+            unknown_labels.add(label)
+        elif primary:
+            outcome_counts_total[primary] += 1
+
+        if is_ready:
+            class_counts_ready[label] += 1
             if primary:
-                increment(outcome_counts_total, primary)
-        else:
-            unknown_labels.append(label)
+                outcome_counts_ready[primary] += 1
 
-        if str(entry.get("status") or "").lower() == "ready":
-            increment(class_counts_ready, label)
-            if row:
-                primary = str(row.get("primary_outcome") or "").strip()
-                if primary:
-                    increment(outcome_counts_ready, primary)
+    duplicate_name_map = {name: count for name, count in seen_names.items() if count > 1}
+    duplicate_url_map = {url: count for url, count in seen_urls.items() if count > 1}
 
     ready_values = list(class_counts_ready.values())
     total_values = list(class_counts_total.values())
@@ -199,13 +173,13 @@ def main() -> None:
     }
 
     recommendations: list[str] = []
-    if len(ready_entries) < 100:
+    if ready_count < 100:
         recommendations.append("Increase ready image count to at least 100 before first training round.")
     if balance["ready"]["median_samples_per_class"] < 3:
         recommendations.append("Raise median ready samples per class to >=3 to reduce collapse on rare labels.")
-    if len(missing_url_ready) > 0:
+    if missing_url_ready > 0:
         recommendations.append("Fix ready entries with empty URLs before training/evaluation.")
-    if len(negative_entries) < 20:
+    if negative_count < 20:
         recommendations.append("Add more negative/no-target images to control false positives.")
     if len(duplicate_url_map) > 0:
         recommendations.append("De-duplicate repeated image URLs to reduce overfitting to identical scenes.")
@@ -218,16 +192,16 @@ def main() -> None:
         },
         "counts": {
             "total_entries": len(images),
-            "ready_entries": len(ready_entries),
-            "todo_entries": len(todo_entries),
-            "negative_entries": len(negative_entries),
-            "missing_url_total": len(missing_url_total),
-            "missing_url_ready": len(missing_url_ready),
+            "ready_entries": ready_count,
+            "todo_entries": todo_count,
+            "negative_entries": negative_count,
+            "missing_url_total": missing_url_total,
+            "missing_url_ready": missing_url_ready,
         },
         "quality_checks": {
             "duplicate_name_count": len(duplicate_name_map),
             "duplicate_url_count": len(duplicate_url_map),
-            "unknown_label_count": len(unique(unknown_labels)),
+            "unknown_label_count": len(unknown_labels),
         },
         "class_balance": balance,
         "distributions": {
@@ -240,7 +214,7 @@ def main() -> None:
             "names": duplicate_name_map,
             "urls": duplicate_url_map,
         },
-        "unknown_labels": sorted(unique(unknown_labels)),
+        "unknown_labels": sorted(unknown_labels),
         "recommendations": recommendations,
     }
 
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import argparse
 import json
+import os
 import subprocess
 import sys
 from pathlib import Path
@@ -31,11 +32,12 @@ def parse_args() -> argparse.Namespace:
 def resolve_latest_candidate_dir(root_dir: Path) -> Path | None:
     if not root_dir.exists() or not root_dir.is_dir():
         return None
-    dirs = [p for p in root_dir.iterdir() if p.is_dir()]
+    with os.scandir(root_dir) as entries:
+        dirs = [entry for entry in entries if entry.is_dir()]
     if not dirs:
         return None
-    dirs.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-    return dirs[0]
+    latest = max(dirs, key=lambda entry: entry.stat().st_mtime)
+    return Path(latest.path)
 
 
 def resolve_candidate_artifact(candidate_dir: Path, names: list[str]) -> Path | None:
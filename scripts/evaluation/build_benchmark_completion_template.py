@@ -4,6 +4,11 @@ import csv
 import json
 from pathlib import Path
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Build benchmark completion CSV template from selected batches.")
@@ -29,6 +34,8 @@ def rel_or_abs(path: Path, cwd: Path) -> str:
 
 
 def load_json(path: Path):
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
     return json.loads(path.read_text(encoding="utf-8"))
 
 
@@ -89,8 +96,7 @@ def main() -> None:
     with out_path.open("w", encoding="utf-8", newline="") as handle:
         writer = csv.DictWriter(handle, fieldnames=header)
         writer.writeheader()
-        for row in deduped:
-            writer.writerow({column: row.get(column, "") for column in header})
+        writer.writerows({column: row.get(column, "") for column in header} for row in deduped)
 
     print("Benchmark completion template generated")
     print(
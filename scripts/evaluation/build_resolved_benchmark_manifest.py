@@ -2,13 +2,34 @@
 import argparse
 import csv
 import json
+import os
 import re
 import shutil
 import subprocess
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from urllib.parse import urlparse, unquote
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+try:
+    import pycurl
+except Exception:
+    pycurl = None
+
+HTTP_URL_RE = re.compile(r"^https?://", re.IGNORECASE)
+FILE_URL_RE = re.compile(r"^file://", re.IGNORECASE)
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+EDGE_DASH_RE = re.compile(r"^-+|-+$")
+EXTENSION_RE = re.compile(r"\.([a-zA-Z0-9]{2,6})(?:[?#].*)?$")
+CURL_RETRIES = 3
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Build a resolved benchmark manifest with local cache paths.")
@@ -39,7 +60,14 @@ def parse_args() -> argparse.Namespace:
         help="Output manifest path.",
     )
     parser.add_argument("--no-download", action="store_true", help="Disable HTTP downloads.")
+    parser.add_argument("--download-workers", type=int, default=8, help="Concurrent HTTP downloads.")
     parser.add_argument("--no-copy-local", action="store_true", help="Disable local file copy into cache.")
+    parser.add_argument(
+        "--copy-workers",
+        type=int,
+        default=(os.cpu_count() or 4) * 2,
+        help="Concurrent local file copies into cache.",
+    )
     return parser.parse_args()
 
 
@@ -51,9 +79,20 @@ def rel_or_abs(path: Path, cwd: Path) -> str:
 
 
 def load_json(file_path: Path):
+    if orjson is not None:
+        return orjson.loads(file_path.read_bytes())
     return json.loads(file_path.read_text(encoding="utf-8"))
 
 
+def write_json(file_path: Path, payload) -> None:
+    if orjson is not None:
+        file_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
+    with file_path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+        handle.write("\n")
+
+
 def load_append_images(paths: list[str], cwd: Path) -> dict:
     images = []
     loaded = []
@@ -69,7 +108,7 @@ def load_append_images(paths: list[str], cwd: Path) -> dict:
         if isinstance(rows, list):
             for row in rows:
                 if isinstance(row, dict):
-                    images.append(dict(row))
+                    images.append(row)
         loaded.append(rel_or_abs(full_path, cwd))
 
     return {"images": images, "loaded": loaded, "missing": missing}
@@ -79,44 +118,53 @@ def load_completed_map(file_path: Path) -> dict[str, str]:
     if not file_path.exists():
         return {}
 
-    rows = file_path.read_text(encoding="utf-8").splitlines()
-    rows = [line for line in rows if line.strip()]
-    if not rows:
-        return {}
-
     out: dict[str, str] = {}
-    # Preserve JS behavior: skip first row as header.
-    for line in rows[1:]:
-        cols = next(csv.reader([line]))
-        name = str(cols[0] if len(cols) > 0 else "").strip()
-        url = str(cols[1] if len(cols) > 1 else "").strip()
-        if name and url:
-            out[name] = url
+    header_seen = False
+    with file_path.open("r", encoding="utf-8", newline="") as handle:
+        for cols in csv.reader(handle):
+            if not cols or (len(cols) == 1 and not cols[0].strip()):
+                continue
+            # Preserve JS behavior: skip first row as header.
+            if not header_seen:
+                header_seen = True
+                continue
+            name = cols[0].strip()
+            url = cols[1].strip() if len(cols) > 1 else ""
+            if name and url:
+                out[name] = url
     return out
 
 
 def is_http_url(value: str) -> bool:
-    return bool(re.match(r"^https?://", str(value or ""), flags=re.IGNORECASE))
+    return bool(HTTP_URL_RE.match(str(value or "")))
 
 
 def is_file_url(value: str) -> bool:
-    return bool(re.match(r"^file://", str(value or ""), flags=re.IGNORECASE))
+    return bool(FILE_URL_RE.match(str(value or "")))
 
 
 def sanitize_name(value: str) -> str:
     text = str(value or "").lower()
-    text = re.sub(r"[^a-z0-9]+", "-", text)
-    text = re.sub(r"^-+|-+$", "", text)
+    text = NON_ALNUM_RE.sub("-", text)
+    text = EDGE_DASH_RE.sub("", text)
     return text[:120]
 
 
 def extension_from_url(value: str) -> str:
-    match = re.search(r"\.([a-zA-Z0-9]{2,6})(?:[?#].*)?$", str(value or ""))
+    match = EXTENSION_RE.search(str(value or ""))
     if not match:
         return ".jpg"
     return f".{match.group(1).lower()}"
 
 
+def list_cached_names(cache_dir: Path) -> set[str]:
+    try:
+        with os.scandir(cache_dir) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+
+
 def build_cache_path(cache_dir: Path, image_name: str, source_url: str) -> Path:
     base = sanitize_name(image_name) or "sample"
     ext = extension_from_url(source_url)
@@ -146,11 +194,144 @@ def download_to_cache(url: str, out_file: Path) -> None:
     )
 
 
+def partial_path(out_file: Path) -> Path:
+    return out_file.with_name(f"{out_file.name}.part")
+
+
+def open_curl_transfer(url: str, out_file: Path):
+    # Write to a .part file so a failed transfer never truncates or removes out_file.
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    target = partial_path(out_file).open("wb")
+    handle = pycurl.Curl()
+    handle.setopt(pycurl.URL, url)
+    handle.setopt(pycurl.FOLLOWLOCATION, 1)
+    handle.setopt(pycurl.CONNECTTIMEOUT, 20)
+    handle.setopt(pycurl.TIMEOUT, 90)
+    handle.setopt(pycurl.FAILONERROR, 1)
+    handle.setopt(pycurl.WRITEDATA, target)
+    return handle, target
+
+
+def download_all_with_pycurl(jobs: dict[Path, list[str]], workers: int) -> dict[Path, dict[str, Exception | None]]:
+    # Each cache path tries its URLs in order until one succeeds. Failed transfers are
+    # retried after 1s, 2s, 4s like `curl --retry`, so a throttled host is not hit again at once.
+    results: dict[Path, dict[str, Exception | None]] = {out_file: {} for out_file in jobs}
+    queue = deque((out_file, 0, 0, 0.0) for out_file in jobs)
+    active: dict = {}
+    multi = pycurl.CurlMulti()
+
+    def finish(handle, message: str | None) -> None:
+        out_file, index, attempt, target = active.pop(handle)
+        multi.remove_handle(handle)
+        handle.close()
+        target.close()
+        url = jobs[out_file][index]
+        if message is None:
+            os.replace(partial_path(out_file), out_file)
+            results[out_file][url] = None
+            return
+        partial_path(out_file).unlink(missing_ok=True)
+        if attempt < CURL_RETRIES:
+            queue.append((out_file, index, attempt + 1, time.monotonic() + 2**attempt))
+            return
+        results[out_file][url] = RuntimeError(message)
+        if index + 1 < len(jobs[out_file]):
+            queue.append((out_file, index + 1, 0, 0.0))
+
+    while queue or active:
+        now = time.monotonic()
+        for _ in range(len(queue)):
+            if len(active) >= max(1, workers):
+                break
+            job = queue.popleft()
+            out_file, index, attempt, not_before = job
+            if not_before > now:
+                queue.append(job)
+                continue
+            handle, target = open_curl_transfer(jobs[out_file][index], out_file)
+            active[handle] = (out_file, index, attempt, target)
+            multi.add_handle(handle)
+
+        if not active:
+            time.sleep(max(0.0, min(job[3] for job in queue) - time.monotonic()))
+            continue
+
+        status, _ = multi.perform()
+        while status == pycurl.E_CALL_MULTI_PERFORM:
+            status, _ = multi.perform()
+
+        while True:
+            queued, succeeded, failed = multi.info_read()
+            for handle in succeeded:
+                finish(handle, None)
+            for handle, _, message in failed:
+                finish(handle, message)
+            if queued == 0:
+                break
+
+        if active:
+            timeout = 1.0
+            if len(active) < max(1, workers):
+                # A slot is free: wake when the next queued job may start (now, if one is ready).
+                now = time.monotonic()
+                timeout = min([timeout, *(max(0.0, job[3] - now) for job in queue)])
+            multi.select(timeout)
+
+    multi.close()
+    return results
+
+
+def download_first_to_cache(urls: list[str], out_file: Path) -> dict[str, Exception | None]:
+    results: dict[str, Exception | None] = {}
+    for url in urls:
+        try:
+            download_to_cache(url, out_file)
+            results[url] = None
+            break
+        except Exception as error:  # noqa: BLE001
+            results[url] = error
+    return results
+
+
+def download_all_to_cache(jobs: dict[Path, list[str]], workers: int) -> dict[Path, dict[str, Exception | None]]:
+    if not jobs:
+        return {}
+    if pycurl is not None:
+        return download_all_with_pycurl(jobs, workers)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        return dict(zip(jobs, executor.map(download_first_to_cache, jobs.values(), jobs.keys())))
+
+
 def copy_local_to_cache(local_path: Path, out_file: Path) -> None:
     out_file.parent.mkdir(parents=True, exist_ok=True)
+    if hasattr(os, "copy_file_range"):
+        try:
+            with local_path.open("rb") as source, out_file.open("wb") as target:
+                remaining = os.fstat(source.fileno()).st_size
+                while remaining > 0:
+                    sent = os.copy_file_range(source.fileno(), target.fileno(), remaining)
+                    if sent == 0:
+                        break
+                    remaining -= sent
+            return
+        except OSError:
+            pass
     shutil.copyfile(local_path, out_file)
 
 
+def copy_all_to_cache(jobs: dict[Path, Path], workers: int) -> None:
+    if not jobs:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [
+            executor.submit(copy_local_to_cache, local_path, out_file)
+            for out_file, local_path in jobs.items()
+        ]
+        for future in futures:
+            future.result()
+
+
 def resolve_local_path(raw_url: str) -> Path | None:
     value = str(raw_url or "").strip()
     if not value:
@@ -172,21 +353,32 @@ def normalize_label_list(value) -> list[str]:
     return out
 
 
+def label_list_key(value, cache: dict[tuple, tuple[str, ...]]) -> tuple[str, ...]:
+    if not isinstance(value, list):
+        return ()
+    raw = tuple(value)
+    if not all(isinstance(item, str) for item in raw):
+        return tuple(normalize_label_list(value))
+    key = cache.get(raw)
+    if key is None:
+        key = tuple(normalize_label_list(value))
+        cache[raw] = key
+    return key
+
+
 def dedupe_exact_rows(rows: list[dict]) -> dict:
     seen = set()
     deduped = []
     removed = 0
+    label_keys: dict[tuple, tuple[str, ...]] = {}
 
     for entry in rows:
-        key = json.dumps(
-            {
-                "name": str(entry.get("name") or "").strip(),
-                "url": str(entry.get("url") or "").strip(),
-                "status": str(entry.get("status") or "").strip(),
-                "expected_any": normalize_label_list(entry.get("expected_any")),
-                "expected_all": normalize_label_list(entry.get("expected_all")),
-            },
-            sort_keys=True,
+        key = (
+            str(entry.get("name") or "").strip(),
+            str(entry.get("url") or "").strip(),
+            str(entry.get("status") or "").strip(),
+            label_list_key(entry.get("expected_any"), label_keys),
+            label_list_key(entry.get("expected_all"), label_keys),
         )
         if key in seen:
             removed += 1
@@ -225,9 +417,16 @@ def main() -> None:
     updated = []
     downloaded_count = 0
     copied_count = 0
-
-    for entry in images:
-        next_entry = dict(entry)
+    cached_names = list_cached_names(cache_dir)
+    copy_jobs: dict[Path, Path] = {}
+    # Rows sharing a cache path queue their URLs in row order; the first to download wins.
+    download_jobs: dict[Path, list[str]] = {}
+    pending_downloads: list[tuple[dict, Path, str]] = []
+    # Local files whose cache path is already queued for download; copied only if every URL fails.
+    copy_fallbacks: dict[Path, Path] = {}
+
+    # Rows come straight from load_json and the output replaces "images", so update them in place.
+    for next_entry in images:
         name = str(next_entry.get("name") or "").strip()
         override = completed_map.get(name)
         source_url = str(override or next_entry.get("url") or "").strip()
@@ -242,17 +441,14 @@ def main() -> None:
 
         if is_http_url(source_url):
             out_file = build_cache_path(cache_dir, name, source_url)
-            if not out_file.exists():
+            if out_file.name not in cached_names and out_file not in copy_fallbacks:
                 if not args.no_download:
-                    try:
-                        download_to_cache(source_url, out_file)
-                        downloaded_count += 1
-                    except Exception as error:  # noqa: BLE001
-                        next_entry["url"] = ""
-                        next_entry["status"] = "todo"
-                        next_entry["resolve_error"] = f"download_failed: {error}"
-                        updated.append(next_entry)
-                        continue
+                    urls = download_jobs.setdefault(out_file, [])
+                    if source_url not in urls:
+                        urls.append(source_url)
+                    pending_downloads.append((next_entry, out_file, source_url))
+                    updated.append(next_entry)
+                    continue
                 else:
                     next_entry["url"] = ""
                     next_entry["status"] = "todo"
@@ -266,7 +462,7 @@ def main() -> None:
             continue
 
         local_path = resolve_local_path(source_url)
-        if not local_path:
+        if not local_path or not local_path.exists():
             next_entry["url"] = ""
             next_entry["status"] = "todo"
             next_entry["resolve_error"] = "local_not_found"
@@ -274,18 +470,14 @@ def main() -> None:
             continue
 
         local_path = local_path.resolve()
-        if not local_path.exists():
-            next_entry["url"] = ""
-            next_entry["status"] = "todo"
-            next_entry["resolve_error"] = "local_not_found"
-            updated.append(next_entry)
-            continue
 
         if not args.no_copy_local:
             out_file = build_cache_path(cache_dir, name, str(local_path))
-            if not out_file.exists():
-                copy_local_to_cache(local_path, out_file)
-                copied_count += 1
+            if out_file in download_jobs:
+                copy_fallbacks.setdefault(out_file, local_path)
+            elif out_file.name not in cached_names:
+                copy_jobs[out_file] = local_path
+                cached_names.add(out_file.name)
             next_entry["url"] = rel_or_abs(out_file, cwd)
         else:
             next_entry["url"] = rel_or_abs(local_path, cwd)
@@ -293,6 +485,30 @@ def main() -> None:
         next_entry["status"] = "ready"
         updated.append(next_entry)
 
+    copy_all_to_cache(copy_jobs, args.copy_workers)
+    copied_count += len(copy_jobs)
+
+    download_results = download_all_to_cache(download_jobs, args.download_workers)
+    downloaded = {out_file for out_file, results in download_results.items() if None in results.values()}
+    downloaded_count += len(downloaded)
+    fallback_jobs = {out_file: local_path for out_file, local_path in copy_fallbacks.items() if out_file not in downloaded}
+    copy_all_to_cache(fallback_jobs, args.copy_workers)
+    copied_count += len(fallback_jobs)
+
+    # As in a sequential pass, a row is ready once its own URL or an earlier row's succeeded.
+    present: set[Path] = set()
+    for next_entry, out_file, source_url in pending_downloads:
+        error = None if out_file in present else download_results[out_file][source_url]
+        if error is None:
+            present.add(out_file)
+        else:
+            next_entry["url"] = ""
+            next_entry["status"] = "todo"
+            next_entry["resolve_error"] = f"download_failed: {error}"
+            continue
+        next_entry["url"] = rel_or_abs(out_file, cwd)
+        next_entry["status"] = "ready"
+
     dedupe = dedupe_exact_rows(updated)
     images_out = dedupe["rows"]
 
@@ -312,10 +528,10 @@ def main() -> None:
     )
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(output, indent=2) + "\n", encoding="utf-8")
+    write_json(out_path, output)
 
     resolved = sum(1 for entry in images_out if str(entry.get("status") or "").lower() == "ready")
-    unresolved = sum(1 for entry in images_out if str(entry.get("status") or "").lower() != "ready")
+    unresolved = len(images_out) - resolved
 
     print("Resolved benchmark manifest generated")
     print(
@@ -1,14 +1,45 @@
 #!/usr/bin/env python3
 import argparse
 import csv
+import hashlib
+import io
 import json
 import os
 import re
 import shutil
 import subprocess
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+try:
+    import pycurl
+except Exception:
+    pycurl = None
+
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+EDGE_DASH_RE = re.compile(r"^-+|-+$")
+WHITESPACE_RE = re.compile(r"\s+")
+FOLDER_NOTE_RE = re.compile(r"(?:^|;\s*)folder=([^;]+)", re.IGNORECASE)
+SOURCE_IMAGE_NOTE_RE = re.compile(r"(?:^|;\s*)source_image=([^;]+)", re.IGNORECASE)
+SOURCE_URL_NOTE_RE = re.compile(r"(?:^|;\s*)source_url=([^;]+)", re.IGNORECASE)
+IMAGE_SUFFIXES = (".jpg", ".jpeg", ".png", ".webp")
+EXTENSION_RE = re.compile(r"\.([a-zA-Z0-9]{2,6})(?:[?#].*)?$")
+HTTP_URL_RE = re.compile(r"^https?://", re.IGNORECASE)
+KAGGLE_SOURCE_MARKER = b"kaggle_household_waste_images"
+POOL_CACHE_NAME = ".pool_cache.json"
+MANUAL_PREFETCH_DIR_NAME = ".manual-prefetch"
+CURL_RETRIES = 3
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Build supported holdout manifest from model labels + source pools.")
@@ -41,6 +72,18 @@ def parse_args() -> argparse.Namespace:
     )
     parser.add_argument("--per-label", type=int, default=3, help="Requested holdout samples per label.")
     parser.add_argument("--no-download", action="store_true", help="Disable manual HTTP URL download.")
+    parser.add_argument("--download-workers", type=int, default=8, help="Concurrent manual HTTP URL downloads.")
+    parser.add_argument(
+        "--copy-mode",
+        choices=("hardlink", "copy"),
+        default="hardlink",
+        help="How to place local images in the cache (hardlink falls back to copy across devices).",
+    )
+    parser.add_argument(
+        "--no-pool-cache",
+        action="store_true",
+        help="Re-walk Kaggle folders instead of reusing the cached image listing.",
+    )
     parser.add_argument(
         "--out",
         default=str(Path("test") / "benchmarks" / "benchmark-manifest.supported-holdout.json"),
@@ -75,26 +118,25 @@ def resolve_kaggle_dir(input_value: str) -> Path | None:
 
 
 def resolve_latest_candidate_labels(candidates_root: str) -> Path | None:
-    root = Path(candidates_root).resolve()
+    root = Path(os.path.abspath(candidates_root))
     if not root.exists() or not root.is_dir():
         return None
 
-    dirs = [path for path in root.iterdir() if path.is_dir()]
-    dirs.sort(key=lambda path: path.stat().st_mtime, reverse=True)
+    with os.scandir(root) as entries:
+        dirs = [(entry.stat().st_mtime, entry.path) for entry in entries if entry.is_dir()]
+    dirs.sort(key=itemgetter(0), reverse=True)
 
-    for directory in dirs:
-        preferred = directory / "yolo-repath.labels.json"
-        legacy = directory / "yolov8.labels.json"
-        if preferred.exists():
-            return preferred
-        if legacy.exists():
-            return legacy
+    for _, directory in dirs:
+        for name in ("yolo-repath.labels.json", "yolov8.labels.json"):
+            labels_path = os.path.join(directory, name)
+            if os.path.isfile(labels_path):
+                return Path(labels_path)
     return None
 
 
 def slugify(value: str) -> str:
-    text = re.sub(r"[^a-z0-9]+", "-", str(value or "").lower())
-    text = re.sub(r"^-+|-+$", "", text)
+    text = NON_ALNUM_RE.sub("-", str(value or "").lower())
+    text = EDGE_DASH_RE.sub("", text)
     return text[:80]
 
 
@@ -108,21 +150,25 @@ def read_excluded_kaggle_keys(csv_path: Path) -> set[str]:
     if not csv_path.exists():
         return keys
 
-    rows = csv_path.read_text(encoding="utf-8").splitlines()
-    if len(rows) < 2:
+    data = csv_path.read_bytes()
+    if KAGGLE_SOURCE_MARKER not in data:
         return keys
 
-    for line in rows[1:]:
-        if not line.strip():
-            continue
-        cols = next(csv.reader([line]))
-        source = str(cols[4] if len(cols) > 4 else "").strip()
-        notes = str(cols[5] if len(cols) > 5 else "").strip()
-        if source != "kaggle_household_waste_images":
+    lines = data.splitlines()
+    if any(line.count(b'"') % 2 for line in lines):
+        # A quoted field spans physical lines, so rows cannot be prefiltered per line.
+        reader = csv.reader(io.StringIO(data.decode("utf-8"), newline=""))
+        next(reader, None)
+    else:
+        reader = csv.reader(line.decode("utf-8") for line in lines[1:] if KAGGLE_SOURCE_MARKER in line)
+
+    for cols in reader:
+        if len(cols) < 5 or cols[4].strip() != "kaggle_household_waste_images":
             continue
+        notes = cols[5].strip() if len(cols) > 5 else ""
 
-        folder_match = re.search(r"(?:^|;\s*)folder=([^;]+)", notes, flags=re.IGNORECASE)
-        image_match = re.search(r"(?:^|;\s*)source_image=([^;]+)", notes, flags=re.IGNORECASE)
+        folder_match = FOLDER_NOTE_RE.search(notes)
+        image_match = SOURCE_IMAGE_NOTE_RE.search(notes)
         if not folder_match or not image_match:
             continue
 
@@ -134,18 +180,33 @@ def read_excluded_kaggle_keys(csv_path: Path) -> set[str]:
     return keys
 
 
+def load_json(file_path: Path):
+    if orjson is not None:
+        return orjson.loads(file_path.read_bytes())
+    return json.loads(file_path.read_text(encoding="utf-8"))
+
+
+def write_json(file_path: Path, payload) -> None:
+    if orjson is not None:
+        file_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
+    with file_path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+        handle.write("\n")
+
+
 def load_manual_seed(seed_path: Path) -> dict:
     if not seed_path.exists():
         return {"seed_path": seed_path, "labels": {}}
 
-    payload = json.loads(seed_path.read_text(encoding="utf-8"))
+    payload = load_json(seed_path)
     labels = payload.get("labels") if isinstance(payload, dict) else {}
     labels = labels if isinstance(labels, dict) else {}
     return {"seed_path": seed_path, "labels": labels}
 
 
 def normalize_url_for_compare(value: str) -> str:
-    return re.sub(r"\s+", " ", str(value or "").strip())
+    return WHITESPACE_RE.sub(" ", str(value or "").strip())
 
 
 def load_excluded_training_urls(manifest_path: Path) -> dict:
@@ -153,7 +214,7 @@ def load_excluded_training_urls(manifest_path: Path) -> dict:
     if not manifest_path.exists():
         return {"manifest_path": manifest_path, "urls": urls}
 
-    payload = json.loads(manifest_path.read_text(encoding="utf-8"))
+    payload = load_json(manifest_path)
     samples = payload.get("samples") if isinstance(payload, dict) else []
     samples = samples if isinstance(samples, list) else []
 
@@ -166,7 +227,7 @@ def load_excluded_training_urls(manifest_path: Path) -> dict:
             urls.add(image)
 
         notes = str(sample.get("notes") or "")
-        source_match = re.search(r"(?:^|;\s*)source_url=([^;]+)", notes, flags=re.IGNORECASE)
+        source_match = SOURCE_URL_NOTE_RE.search(notes)
         if source_match:
             source_url = normalize_url_for_compare(source_match.group(1))
             if source_url:
@@ -175,18 +236,24 @@ def load_excluded_training_urls(manifest_path: Path) -> dict:
     return {"manifest_path": manifest_path, "urls": urls}
 
 
-def list_images(root_dir: Path) -> list[Path]:
-    if not root_dir.exists() or not root_dir.is_dir():
+def list_images(root_dir: Path) -> list[str]:
+    if not root_dir.is_dir():
         return []
 
     out = []
-    for path in root_dir.rglob("*"):
-        if not path.is_file():
-            continue
-        if not re.search(r"\.(jpg|jpeg|png|webp)$", path.name, flags=re.IGNORECASE):
+    pending = [str(root_dir)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.lower().endswith(IMAGE_SUFFIXES) and entry.is_file():
+                        out.append(entry.path)
+        except PermissionError:
+            # rglob skipped unreadable subdirectories; keep doing the same.
             continue
-        out.append(path)
-    out.sort(key=lambda item: str(item))
+    out.sort()
     return out
 
 
@@ -207,22 +274,81 @@ def get_kaggle_folder_mapping() -> dict[str, list[str]]:
     }
 
 
-def build_image_pool(kaggle_dir: Path, labels: list[str], mapping: dict[str, list[str]]) -> dict[str, list[dict]]:
+def folder_signature(folder_path: Path) -> list:
+    # Kaggle folders keep images one level down (e.g. default/, real_world/), so
+    # track the subfolder mtimes too: adding a file there leaves the top mtime alone.
+    try:
+        signature: list = [folder_path.stat().st_mtime]
+        with os.scandir(folder_path) as entries:
+            subdirs = [[entry.name, entry.stat().st_mtime] for entry in entries if entry.is_dir(follow_symlinks=False)]
+    except OSError:
+        return []
+    signature.extend(sorted(subdirs))
+    return signature
+
+
+def load_pool_cache(cache_path: Path, kaggle_dir: Path) -> dict:
+    if not cache_path.exists():
+        return {}
+    try:
+        payload = load_json(cache_path)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("kaggle_dir") != str(kaggle_dir):
+        return {}
+    folders = payload.get("folders")
+    return folders if isinstance(folders, dict) else {}
+
+
+def save_pool_cache(cache_path: Path, kaggle_dir: Path, folders: dict) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(f"{cache_path.name}.tmp")
+    payload = {"kaggle_dir": str(kaggle_dir), "folders": folders}
+    if orjson is not None:
+        tmp_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE))
+    else:
+        tmp_path.write_text(json.dumps(payload) + "\n", encoding="utf-8")
+    os.replace(tmp_path, cache_path)
+
+
+def list_folder_images(kaggle_dir: Path, folder: str, cache: dict) -> tuple[list[str], bool]:
+    folder_path = kaggle_dir / folder
+    signature = folder_signature(folder_path)
+    cached = cache.get(folder)
+    if isinstance(cached, dict) and cached.get("signature") == signature and isinstance(cached.get("entries"), list):
+        return cached["entries"], False
+
+    prefix_len = len(os.path.join(str(kaggle_dir), ""))
+    entries = [full_path[prefix_len:].replace(os.sep, "/") for full_path in list_images(folder_path)]
+    cache[folder] = {"signature": signature, "entries": entries}
+    return entries, True
+
+
+def build_image_pool(
+    kaggle_dir: Path,
+    labels: list[str],
+    mapping: dict[str, list[str]],
+    cache_path: Path | None = None,
+) -> dict[str, list[dict]]:
     pool: dict[str, list[dict]] = {}
+    cache = load_pool_cache(cache_path, kaggle_dir) if cache_path else {}
+    cache_changed = False
+    listings: dict[str, list[str]] = {}
 
     for label in labels:
         folders = mapping.get(label, [])
         images: list[dict] = []
         for folder in folders:
-            folder_path = kaggle_dir / folder
-            for full_path in list_images(folder_path):
-                rel = full_path.relative_to(kaggle_dir).as_posix()
+            if folder not in listings:
+                listings[folder], changed = list_folder_images(kaggle_dir, folder, cache)
+                cache_changed = cache_changed or changed
+            for rel in listings[folder]:
                 parts = rel.split("/")
                 folder_key = f"{parts[0]}/{parts[1]}" if len(parts) >= 3 else parts[0]
                 source_image = parts[-1]
                 images.append(
                     {
-                        "full_path": full_path,
+                        "full_path": os.path.join(str(kaggle_dir), *parts),
                         "folder": folder_key,
                         "source_image": source_image,
                         "key": f"{folder_key}/{source_image}",
@@ -230,18 +356,20 @@ def build_image_pool(kaggle_dir: Path, labels: list[str], mapping: dict[str, lis
                 )
         pool[label] = images
 
+    if cache_path and cache_changed:
+        save_pool_cache(cache_path, kaggle_dir, cache)
     return pool
 
 
 def extension_from_url(value: str) -> str:
-    match = re.search(r"\.([a-zA-Z0-9]{2,6})(?:[?#].*)?$", str(value or ""))
+    match = EXTENSION_RE.search(str(value or ""))
     if not match:
         return ".jpg"
     return f".{match.group(1).lower()}"
 
 
 def is_http_url(value: str) -> bool:
-    return bool(re.match(r"^https?://", str(value or ""), flags=re.IGNORECASE))
+    return bool(HTTP_URL_RE.match(str(value or "")))
 
 
 def download_url(url: str, out_file: Path) -> None:
@@ -267,11 +395,166 @@ def download_url(url: str, out_file: Path) -> None:
     )
 
 
-def copy_local(local_path: Path, out_file: Path) -> None:
+def copy_local(local_path: str | Path, out_file: Path, mode: str = "hardlink") -> None:
     out_file.parent.mkdir(parents=True, exist_ok=True)
+    if mode == "hardlink":
+        try:
+            os.link(local_path, out_file)
+            return
+        except OSError:
+            # Cross-device or unsupported filesystem; fall back to a byte copy.
+            pass
     shutil.copyfile(local_path, out_file)
 
 
+def holdout_row(name: str, url: str, label: str, item_id: str, notes: str) -> dict:
+    return {
+        "name": name,
+        "url": url,
+        "expected_any": [label],
+        "expected_all": [],
+        "item_id": item_id,
+        "required": False,
+        "status": "ready",
+        "notes": notes,
+    }
+
+
+def plan_manual_prefetch(
+    labels: list[str],
+    kaggle_counts: list[int],
+    manual_labels,
+    excluded_training_urls: frozenset[str],
+    per_label: int,
+    cache_dir: Path,
+) -> list[str]:
+    # Mirror the manual fill pass, assuming every attempt succeeds, to find the
+    # HTTP URLs it will need to fetch. Failed prefetches just leave gaps the fill
+    # pass handles the same way as a failed direct download.
+    urls: list[str] = []
+    claimed: set[str] = set()
+    for label, selected_count in zip(labels, kaggle_counts):
+        manual_urls = manual_labels.get(label) if isinstance(manual_labels, dict) else []
+        if not isinstance(manual_urls, list):
+            continue
+        slug = slugify(label)
+        manual_index = 1
+        for raw_url in manual_urls:
+            if selected_count >= per_label:
+                break
+            url = str(raw_url or "").strip()
+            if not url or url in claimed or normalize_url_for_compare(url) in excluded_training_urls:
+                continue
+            if is_http_url(url):
+                out_file = cache_dir / f"holdout_{slug}_manual_v{manual_index}{extension_from_url(url)}"
+                if not out_file.exists() and url not in urls:
+                    urls.append(url)
+            else:
+                out_file = cache_dir / f"holdout_{slug}_manual_v{manual_index}{extension_for_file(url)}"
+                if not out_file.exists() and not os.path.exists(url):
+                    continue
+            claimed.add(url)
+            selected_count += 1
+            manual_index += 1
+    return urls
+
+
+def fetch_to_staging(url: str, staged: Path) -> None:
+    try:
+        download_url(url, staged)
+    except Exception:  # noqa: BLE001
+        staged.unlink(missing_ok=True)
+
+
+def open_curl_transfer(url: str, out_file: Path):
+    out_file.parent.mkdir(parents=True, exist_ok=True)
+    target = out_file.open("wb")
+    handle = pycurl.Curl()
+    handle.setopt(pycurl.URL, url)
+    handle.setopt(pycurl.FOLLOWLOCATION, 1)
+    handle.setopt(pycurl.CONNECTTIMEOUT, 20)
+    handle.setopt(pycurl.TIMEOUT, 90)
+    handle.setopt(pycurl.FAILONERROR, 1)
+    handle.setopt(pycurl.WRITEDATA, target)
+    return handle, target
+
+
+def fetch_all_with_pycurl(jobs: dict[str, Path], workers: int) -> None:
+    # One CurlMulti shares its connection cache across transfers, so seeds on the
+    # same host reuse keep-alive connections instead of a curl process each.
+    # Failed transfers wait 1s, 2s, 4s before retrying, matching `curl --retry`.
+    queue = deque((url, staged, 0, 0.0) for url, staged in jobs.items())
+    active: dict = {}
+    multi = pycurl.CurlMulti()
+
+    def finish(handle, failed: bool) -> None:
+        url, staged, attempt, target = active.pop(handle)
+        multi.remove_handle(handle)
+        handle.close()
+        target.close()
+        if not failed:
+            return
+        staged.unlink(missing_ok=True)
+        if attempt < CURL_RETRIES:
+            queue.append((url, staged, attempt + 1, time.monotonic() + 2**attempt))
+
+    while queue or active:
+        now = time.monotonic()
+        for _ in range(len(queue)):
+            if len(active) >= max(1, workers):
+                break
+            job = queue.popleft()
+            url, staged, attempt, not_before = job
+            if not_before > now:
+                queue.append(job)
+                continue
+            handle, target = open_curl_transfer(url, staged)
+            active[handle] = (url, staged, attempt, target)
+            multi.add_handle(handle)
+
+        if not active:
+            time.sleep(max(0.0, min(job[3] for job in queue) - time.monotonic()))
+            continue
+
+        status, _ = multi.perform()
+        while status == pycurl.E_CALL_MULTI_PERFORM:
+            status, _ = multi.perform()
+
+        while True:
+            queued, succeeded, failed = multi.info_read()
+            for handle in succeeded:
+                finish(handle, False)
+            for handle, _, _ in failed:
+                finish(handle, True)
+            if queued == 0:
+                break
+
+        if active:
+            timeout = 1.0
+            if len(active) < max(1, workers):
+                # A slot is free: wake when the next queued job may start (now, if one is ready).
+                now = time.monotonic()
+                timeout = min([timeout, *(max(0.0, job[3] - now) for job in queue)])
+            multi.select(timeout)
+
+    multi.close()
+
+
+def prefetch_manual_downloads(urls: list[str], prefetch_dir: Path, workers: int) -> dict[str, Path]:
+    staged = {
+        url: prefetch_dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}{extension_from_url(url)}"
+        for url in urls
+    }
+    if not staged:
+        return {}
+    if pycurl is not None:
+        fetch_all_with_pycurl(staged, workers)
+        return staged
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        list(executor.map(fetch_to_staging, staged.keys(), staged.values()))
+    return staged
+
+
 def main() -> None:
     args = parse_args()
     if not args.per_label or args.per_label < 1:
@@ -279,25 +562,27 @@ def main() -> None:
 
     cwd = Path.cwd()
 
-    labels_path = Path(args.labels).resolve() if args.labels else resolve_latest_candidate_labels(args.candidates_root)
+    labels_path = Path(os.path.abspath(args.labels)) if args.labels else resolve_latest_candidate_labels(args.candidates_root)
     kaggle_dir = resolve_kaggle_dir(args.kaggle_dir)
-    csv_path = Path(args.input_csv).resolve()
-    manual_seed = load_manual_seed(Path(args.manual_seed).resolve())
-    training_exclusions = load_excluded_training_urls(Path(args.retraining_manifest).resolve())
-    cache_dir = Path(args.cache_dir).resolve()
-    out_path = Path(args.out).resolve()
+    csv_path = Path(os.path.abspath(args.input_csv))
+    manual_seed = load_manual_seed(Path(os.path.abspath(args.manual_seed)))
+    training_exclusions = load_excluded_training_urls(Path(os.path.abspath(args.retraining_manifest)))
+    cache_dir = Path(os.path.abspath(args.cache_dir))
+    out_path = Path(os.path.abspath(args.out))
 
     if not labels_path or not labels_path.exists():
         raise SystemExit("Labels file not found. Pass --labels or create candidate labels first.")
 
-    labels = json.loads(labels_path.read_text(encoding="utf-8"))
+    labels = load_json(labels_path)
     if not isinstance(labels, list):
         raise SystemExit("Labels file must be a JSON array.")
     labels = [str(label or "").strip() for label in labels if str(label or "").strip()]
 
     mapping = get_kaggle_folder_mapping()
-    excluded = read_excluded_kaggle_keys(csv_path)
-    excluded_training_urls = training_exclusions["urls"]
+    excluded = frozenset(read_excluded_kaggle_keys(csv_path))
+    excluded_training_urls = frozenset(training_exclusions["urls"])
+    manual_labels = manual_seed["labels"]
+    per_label = args.per_label
     selected_keys: set[str] = set()
     selected_manual_urls: set[str] = set()
     unsupported: list[dict] = []
@@ -311,54 +596,61 @@ def main() -> None:
             }
         )
 
-    pool = build_image_pool(kaggle_dir, labels, mapping) if kaggle_dir and kaggle_dir.exists() else {}
+    pool_cache_path = None if args.no_pool_cache else cache_dir / POOL_CACHE_NAME
+    pool = build_image_pool(kaggle_dir, labels, mapping, pool_cache_path) if kaggle_dir and kaggle_dir.exists() else {}
 
     cache_dir.mkdir(parents=True, exist_ok=True)
 
+    kaggle_counts: list[int] = []
     for label in labels:
         candidates = pool.get(label, [])
-        manual_urls = manual_seed["labels"].get(label) if isinstance(manual_seed["labels"], dict) else []
-        manual_urls = manual_urls if isinstance(manual_urls, list) else []
+        slug = slugify(label)
 
+        # Filtered lazily so keys selected earlier in this loop are still skipped.
+        available = (
+            candidate
+            for candidate in candidates
+            if candidate["key"] not in excluded and candidate["key"] not in selected_keys
+        )
         selected_count = 0
-        for candidate in candidates:
-            if selected_count >= args.per_label:
-                break
-            if candidate["key"] in excluded:
-                continue
-            if candidate["key"] in selected_keys:
-                continue
-
-            idx = selected_count + 1
-            slug = slugify(label)
+        for idx, candidate in enumerate(islice(available, per_label), start=1):
             entry_name = f"holdout_{slug}_kaggle_v{idx}"
             out_file = cache_dir / f"{entry_name}{extension_for_file(candidate['full_path'])}"
             if not out_file.exists():
-                shutil.copyfile(candidate["full_path"], out_file)
+                copy_local(candidate["full_path"], out_file, args.copy_mode)
 
             rows.append(
-                {
-                    "name": entry_name,
-                    "url": rel_or_abs(out_file, cwd),
-                    "expected_any": [label],
-                    "expected_all": [],
-                    "item_id": f"holdout-{slug}-v{idx}",
-                    "required": False,
-                    "status": "ready",
-                    "notes": (
-                        "supported-holdout; source=kaggle_household_waste_images; "
-                        f"folder={candidate['folder']}; source_image={candidate['source_image']}"
-                    ),
-                }
+                holdout_row(
+                    entry_name,
+                    rel_or_abs(out_file, cwd),
+                    label,
+                    f"holdout-{slug}-v{idx}",
+                    "supported-holdout; source=kaggle_household_waste_images; "
+                    f"folder={candidate['folder']}; source_image={candidate['source_image']}",
+                )
             )
 
             selected_keys.add(candidate["key"])
-            selected_count += 1
+            selected_count = idx
+        kaggle_counts.append(selected_count)
+
+    prefetch_dir = cache_dir / MANUAL_PREFETCH_DIR_NAME
+    prefetched: dict[str, Path] = {}
+    if not args.no_download:
+        prefetch_urls = plan_manual_prefetch(
+            labels, kaggle_counts, manual_labels, excluded_training_urls, per_label, cache_dir
+        )
+        prefetched = prefetch_manual_downloads(prefetch_urls, prefetch_dir, args.download_workers)
 
-        if selected_count < args.per_label and manual_urls:
+    for label, selected_count in zip(labels, kaggle_counts):
+        manual_urls = manual_labels.get(label) if isinstance(manual_labels, dict) else []
+        manual_urls = manual_urls if isinstance(manual_urls, list) else []
+        slug = slugify(label)
+
+        if selected_count < per_label and manual_urls:
             manual_index = 1
             for raw_url in manual_urls:
-                if selected_count >= args.per_label:
+                if selected_count >= per_label:
                     break
                 url = str(raw_url or "").strip()
                 if not url:
@@ -368,7 +660,6 @@ def main() -> None:
                 if normalize_url_for_compare(url) in excluded_training_urls:
                     continue
 
-                slug = slugify(label)
                 entry_name = f"holdout_{slug}_manual_v{manual_index}"
                 ext = extension_from_url(url) if is_http_url(url) else extension_for_file(url)
                 out_file = cache_dir / f"{entry_name}{ext}"
@@ -378,24 +669,27 @@ def main() -> None:
                         if is_http_url(url):
                             if args.no_download:
                                 continue
-                            download_url(url, out_file)
+                            staged = prefetched.pop(url, None)
+                            if staged is None:
+                                download_url(url, out_file)
+                            elif staged.exists():
+                                os.replace(staged, out_file)
+                            else:
+                                continue
                         else:
-                            local_path = Path(url).resolve()
+                            local_path = Path(os.path.abspath(url))
                             if not local_path.exists():
                                 continue
-                            copy_local(local_path, out_file)
+                            copy_local(local_path, out_file, args.copy_mode)
 
                     rows.append(
-                        {
-                            "name": entry_name,
-                            "url": rel_or_abs(out_file, cwd),
-                            "expected_any": [label],
-                            "expected_all": [],
-                            "item_id": f"holdout-{slug}-manual-v{manual_index}",
-                            "required": False,
-                            "status": "ready",
-                            "notes": f"supported-holdout; source=manual_seed; source_url={url}",
-                        }
+                        holdout_row(
+                            entry_name,
+                            rel_or_abs(out_file, cwd),
+                            label,
+                            f"holdout-{slug}-manual-v{manual_index}",
+                            f"supported-holdout; source=manual_seed; source_url={url}",
+                        )
                     )
 
                     selected_manual_urls.add(url)
@@ -404,17 +698,20 @@ def main() -> None:
                 except Exception:  # noqa: BLE001
                     continue
 
-        if selected_count < args.per_label:
+        if selected_count < per_label:
             unsupported.append(
                 {
                     "label": label,
                     "reason": "insufficient_unique_images",
                     "selected": selected_count,
-                    "requested": args.per_label,
+                    "requested": per_label,
                 }
             )
 
-    rows.sort(key=lambda row: str(row.get("name") or ""))
+    if prefetched or prefetch_dir.exists():
+        shutil.rmtree(prefetch_dir, ignore_errors=True)
+
+    rows.sort(key=itemgetter("name"))
 
     labels_with_rows = {row.get("expected_any", [None])[0] for row in rows if isinstance(row.get("expected_any"), list)}
 
@@ -445,7 +742,7 @@ def main() -> None:
     }
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(out, indent=2) + "\n", encoding="utf-8")
+    write_json(out_path, out)
 
     print("Supported holdout manifest generated")
     print(
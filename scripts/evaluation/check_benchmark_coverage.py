@@ -1,9 +1,16 @@
 #!/usr/bin/env python3
 import argparse
 import json
+import os
+from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    import orjson
+except Exception:
+    orjson = None
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Check benchmark manifest taxonomy coverage.")
@@ -33,47 +40,59 @@ def rel_or_abs(path: Path, cwd: Path) -> str:
 
 
 def load_json(file_path: Path):
+    if orjson is not None:
+        return orjson.loads(file_path.read_bytes())
     return json.loads(file_path.read_text(encoding="utf-8"))
 
 
+def write_json(file_path: Path, payload) -> None:
+    if orjson is not None:
+        file_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+        return
+    with file_path.open("w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
+        handle.write("\n")
+
+
 def to_set(values) -> set[str]:
     if not isinstance(values, list):
         return set()
-    out = set()
-    for value in values:
-        text = str(value or "").strip()
-        if text:
-            out.add(text)
-    return out
+    texts = (value.strip() if isinstance(value, str) else str(value or "").strip() for value in values)
+    return {text for text in texts if text}
 
 
 def set_diff(left: set[str], right: set[str]) -> list[str]:
-    return sorted([value for value in left if value not in right])
+    return sorted(left - right)
 
 
-def get_manifest_labels(images: list[dict], only_ready: bool) -> set[str]:
-    labels: set[str] = set()
+def collect_manifest_labels(images: list[dict]) -> tuple[set[str], set[str]]:
+    labels_all: set[str] = set()
+    labels_ready: set[str] = set()
     for entry in images:
         if not isinstance(entry, dict):
             continue
         is_ready = str(entry.get("status") or "").lower() == "ready"
-        if only_ready and not is_ready:
-            continue
         for field in ("expected_any", "expected_all"):
-            for label in entry.get(field) if isinstance(entry.get(field), list) else []:
+            values = entry.get(field)
+            if not isinstance(values, list):
+                continue
+            for label in values:
                 text = str(label or "").strip()
-                if text:
-                    labels.add(text)
-    return labels
+                if not text:
+                    continue
+                labels_all.add(text)
+                if is_ready:
+                    labels_ready.add(text)
+    return labels_all, labels_ready
 
 
 def main() -> None:
     args = parse_args()
     cwd = Path.cwd()
 
-    taxonomy_path = Path(args.taxonomy).resolve()
-    manifest_path = Path(args.manifest).resolve()
-    out_path = Path(args.out).resolve()
+    taxonomy_path = Path(os.path.abspath(args.taxonomy))
+    manifest_path = Path(os.path.abspath(args.manifest))
+    out_path = Path(os.path.abspath(args.out))
 
     if not taxonomy_path.exists():
         raise SystemExit(f"Taxonomy file not found: {taxonomy_path}")
@@ -89,17 +108,23 @@ def main() -> None:
     images = images if isinstance(images, list) else []
 
     taxonomy_labels = to_set([record.get("canonical_label") for record in classes if isinstance(record, dict)])
-    manifest_labels_all = get_manifest_labels(images, only_ready=False)
-    manifest_labels_ready = get_manifest_labels(images, only_ready=True)
+    manifest_labels_all, manifest_labels_ready = collect_manifest_labels(images)
 
     missing_in_manifest = set_diff(taxonomy_labels, manifest_labels_all)
     missing_in_ready_only = set_diff(taxonomy_labels, manifest_labels_ready)
     unknown_manifest_labels = set_diff(manifest_labels_all, taxonomy_labels)
 
     total_entries = len(images)
-    ready_entries = sum(1 for entry in images if isinstance(entry, dict) and str(entry.get("status") or "").lower() == "ready")
-    todo_entries = sum(1 for entry in images if isinstance(entry, dict) and str(entry.get("status") or "").lower() == "todo")
-    missing_url_entries = sum(1 for entry in images if isinstance(entry, dict) and not str(entry.get("url") or "").strip())
+    status_counts: Counter[str] = Counter()
+    missing_url_entries = 0
+    for entry in images:
+        if not isinstance(entry, dict):
+            continue
+        status_counts[str(entry.get("status") or "").lower()] += 1
+        if not str(entry.get("url") or "").strip():
+            missing_url_entries += 1
+    ready_entries = status_counts["ready"]
+    todo_entries = status_counts["todo"]
 
     coverage = {
         "taxonomy_label_count": len(taxonomy_labels),
@@ -130,7 +155,7 @@ def main() -> None:
     }
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    write_json(out_path, report)
 
     print("Benchmark coverage summary")
     print(json.dumps({"entries": report["entries"], "coverage": report["coverage"]}, indent=2))